@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+動作検出用 numba カーネル
+グレースケール化・縮小・移動平均背景の更新・差分・二値化を1パスで行う
+"""
+
+import os
+import sys
+
+# プロジェクトパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from phase3_hamster_tracking.utils.numba_compat import njit, prange
+
+# OpenCV の 8bit BGR→GRAY 変換と同じ固定小数点係数（Q14）
+_GRAY_SHIFT = 14
+_GRAY_B = 1868
+_GRAY_G = 9617
+_GRAY_R = 4899
+
+@njit("void(uint8[:, :, ::1], float32[:, ::1], uint8[:, ::1], float32, int64, boolean)",
+      parallel=True, fastmath=True, cache=True)
+def fused_detect(frame_bgr, bg, out_mask, alpha, thresh, init_bg):
+    """
+    BGRフレームから移動平均背景に対する前景マスクを1パスで生成
+
+    2x2 画素ブロックの平均で 1/2 に縮小し（平滑化を兼ねる）、
+    cv2.accumulateWeighted → convertScaleAbs → absdiff → threshold と同じ処理を
+    画素をレジスタに保持したまま行う。
+
+    Args:
+        frame_bgr: 入力フレーム (H, W, 3) uint8
+        bg: 移動平均背景 (H//2, W//2) float32（インプレース更新）
+        out_mask: 出力前景マスク (H//2, W//2) uint8
+        alpha: 背景更新率
+        thresh: 二値化閾値（差分がこれを超える画素を 255 とする）
+        init_bg: True なら背景を現フレームで初期化
+    """
+    h, w = out_mask.shape
+    rounding = 1 << (_GRAY_SHIFT - 1)
+
+    for i in prange(h):
+        r0 = 2 * i
+        for j in range(w):
+            c0 = 2 * j
+
+            # 2x2 ブロックのグレースケール値の合計
+            block = 0
+            for di in range(2):
+                for dj in range(2):
+                    b = frame_bgr[r0 + di, c0 + dj, 0]
+                    g = frame_bgr[r0 + di, c0 + dj, 1]
+                    r = frame_bgr[r0 + di, c0 + dj, 2]
+                    block += (b * _GRAY_B + g * _GRAY_G + r * _GRAY_R + rounding) >> _GRAY_SHIFT
+            gray = (block + 2) >> 2
+
+            # 移動平均背景の更新
+            if init_bg:
+                mean = float(gray)
+            else:
+                mean = bg[i, j] * (1.0 - alpha) + gray * alpha
+            bg[i, j] = mean
+
+            # 8bit に丸めた背景との差分を二値化
+            diff = gray - int(mean + 0.5)
+            if diff < 0:
+                diff = -diff
+            out_mask[i, j] = 255 if diff > thresh else 0
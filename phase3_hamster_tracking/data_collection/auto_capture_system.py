@@ -11,8 +11,11 @@ import cv2
 import numpy as np
 import time
 import threading
-import queue
 import logging
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Callable
@@ -25,11 +28,58 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from rtsp_stream import RTSPStream
 from phase3_hamster_tracking.utils.hamster_config import HamsterTrackingConfig, load_config
 from phase3_hamster_tracking.utils.lighting_detector import LightingModeDetector
+from phase3_hamster_tracking.utils.numba_compat import NUMBA_AVAILABLE, njit, prange
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@njit(parallel=True, fastmath=True, cache=True)
+def _quality_kernel(frame):
+    """
+    グレースケール化・輝度統計・ラプラシアン統計を1パスで計算
+
+    Returns:
+        (輝度和, 輝度二乗和, ラプラシアン和, ラプラシアン二乗和, ラプラシアン画素数)
+    """
+    h, w = frame.shape[0], frame.shape[1]
+    sum_g = 0.0
+    sum_g2 = 0.0
+    lap_sum = 0.0
+    lap_sum2 = 0.0
+
+    for i in prange(h):
+        for j in range(w):
+            g = 0.114 * frame[i, j, 0] + 0.587 * frame[i, j, 1] + 0.299 * frame[i, j, 2]
+            sum_g += g
+            sum_g2 += g * g
+
+            # 3x3ラプラシアン（内側画素のみ）
+            if 0 < i < h - 1 and 0 < j < w - 1:
+                up = 0.114 * frame[i - 1, j, 0] + 0.587 * frame[i - 1, j, 1] + 0.299 * frame[i - 1, j, 2]
+                down = 0.114 * frame[i + 1, j, 0] + 0.587 * frame[i + 1, j, 1] + 0.299 * frame[i + 1, j, 2]
+                left = 0.114 * frame[i, j - 1, 0] + 0.587 * frame[i, j - 1, 1] + 0.299 * frame[i, j - 1, 2]
+                right = 0.114 * frame[i, j + 1, 0] + 0.587 * frame[i, j + 1, 1] + 0.299 * frame[i, j + 1, 2]
+                lap = up + down + left + right - 4.0 * g
+                lap_sum += lap
+                lap_sum2 += lap * lap
+
+    lap_count = max((h - 2) * (w - 2), 1)
+    return sum_g, sum_g2, lap_sum, lap_sum2, lap_count
+
+@njit(parallel=True, cache=True)
+def _frame_diff_kernel(prev2, prev1, cur, out, thresh):
+    """3フレーム差分: |cur-prev1| と |prev1-prev2| が共に閾値を超える画素を255にする"""
+    h, w = cur.shape
+    for i in prange(h):
+        for j in range(w):
+            a = cur[i, j]
+            b = prev1[i, j]
+            c = prev2[i, j]
+            d1 = a - b if a > b else b - a
+            d2 = b - c if b > c else c - b
+            out[i, j] = 255 if (d1 > thresh and d2 > thresh) else 0
+
 @dataclass
 class CaptureResult:
     """撮影結果データクラス"""
@@ -66,23 +116,52 @@ class AutoCaptureSystem:
         """
         self.config = config if config else load_config()
         
+        # 設定値は撮影毎に参照しないよう初期化時に解決
+        data_collection = getattr(self.config, 'data_collection', None)
+        self.min_quality = (getattr(data_collection, 'quality', None) or {}).get('min_confidence_ratio', 0.8)
+        self.rtsp_stream_type = getattr(self.config, 'rtsp_stream_type', 'sub')
+        self.storage_base_dir = Path(getattr(self.config, 'storage_base_dir', './data'))
+        self.motion_cooldown = 5.0  # 動作検出後のクールダウン時間（秒）
+        self.capture_interval_minutes = 60  # 定期撮影間隔（分）
+        self.max_storage_days = 7  # 保存日数
+        
         # システム状態
         self.is_running = False
         self.capture_thread: Optional[threading.Thread] = None
         self.motion_thread: Optional[threading.Thread] = None
         
         # 撮影制御
-        self.capture_queue = queue.Queue()
+        # 定期・手動撮影は破棄せず順に処理し、動作トリガーのみ最新優先の1枠で置き換える
+        self.capture_queue: deque = deque()
+        self._pending_motion_request: Optional[Dict] = None
+        self._queue_lock = threading.Lock()
+        self.capture_event = threading.Event()
         self.last_scheduled_capture: Optional[datetime] = None
         self.last_motion_capture: Optional[datetime] = None
+        # 間隔判定用の単調時計（NTP補正の影響を受けない）
+        self._last_scheduled_mono: Optional[float] = None
+        self._last_motion_mono: Optional[float] = None
         
         # 統計情報
         self.stats = CaptureStats()
-        self.capture_history: List[CaptureResult] = []
+        self._trigger_counters: Dict[str, int] = {"motion": 0, "scheduled": 0, "manual": 0}
+        # 長時間稼働でもメモリが増え続けないよう直近の履歴のみ保持
+        self.capture_history: deque = deque(maxlen=1000)
+        # 結果記録は保存ワーカーの完了時に行うため、統計・履歴の更新を排他する
+        self._result_lock = threading.Lock()
         
         # コンポーネント初期化
         self.stream: Optional[RTSPStream] = None
         self.lighting_detector: Optional[LightingModeDetector] = None
+        self._lighting_lock = threading.Lock()
+        
+        # ワーカースレッドのCPU固定・リアルタイム優先度（Linuxのみ、権限がなければ無視、既定は無効）
+        self.pin_worker_threads = False
+        self.worker_rt_priority = 20
+        self._process_cpu_set: Optional[set] = None  # 固定前のCPU集合（保存ワーカーで復元）
+        
+        # JPEGエンコード・メタデータ書き込み用ワーカー（start() で生成）
+        self._io_executor: Optional[ThreadPoolExecutor] = None
         
         # データ保存設定
         self.setup_storage()
@@ -91,11 +170,26 @@ class AutoCaptureSystem:
         self.on_capture_callback: Optional[Callable[[CaptureResult], None]] = None
         self.on_motion_callback: Optional[Callable[[np.ndarray], None]] = None
         
+        # 動作検出用の再利用バッファ（初回フレームで確保）
+        self._motion_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.motion_downscale = 2  # 動作検出の縮小率（1で等倍）
+        # 動作検出方式: "mog2"（背景差分） / "frame_diff"（3フレーム差分、明るいケージ向け）
+        self.motion_method = self.config.motion.capture_trigger_method
+        self.frame_diff_threshold = self.config.motion.frame_diff_threshold
+        self._diff_prev1: Optional[np.ndarray] = None
+        self._diff_prev2: Optional[np.ndarray] = None
+        self._diff_buf: Optional[np.ndarray] = None
+        self._small_buf: Optional[np.ndarray] = None
+        self._gray_buf: Optional[np.ndarray] = None
+        self._blur_buf: Optional[np.ndarray] = None
+        self._fg_buf: Optional[np.ndarray] = None
+        self._open_buf: Optional[np.ndarray] = None
+        
         logger.info("自動撮影システム初期化完了")
     
     def setup_storage(self):
         """データ保存ディレクトリを設定"""
-        base_dir = Path(getattr(self.config, 'storage_base_dir', './data'))
+        base_dir = self.storage_base_dir
         
         # 必要なディレクトリを作成
         self.storage_paths = {
@@ -109,6 +203,14 @@ class AutoCaptureSystem:
         for path_name, path in self.storage_paths.items():
             path.mkdir(parents=True, exist_ok=True)
             logger.info(f"ストレージパス設定: {path_name} -> {path}")
+        
+        # 撮影ごとの Path 生成・文字列化を避けるため事前に文字列化
+        self._raw_frames_dir = str(self.storage_paths['raw_frames'])
+        
+        # メタデータは1撮影1行のJSONLマニフェストに追記（初回書き込み時にオープン）
+        self.manifest_path = self.storage_paths['raw_frames'] / 'manifest.jsonl'
+        self._manifest_fh = None
+        self._manifest_lock = threading.Lock()
     
     def start(self):
         """自動撮影システムを開始"""
@@ -125,9 +227,8 @@ class AutoCaptureSystem:
             camera_config.set_password("894890abc")
             
             # RTSPストリーム初期化
-            stream_type = getattr(self.config, 'rtsp_stream_type', 'sub')
             buffer_size = 1
-            self.stream = RTSPStream(stream_type=stream_type, buffer_size=buffer_size)
+            self.stream = RTSPStream(stream_type=self.rtsp_stream_type, buffer_size=buffer_size)
             
             if not self.stream.start_stream():
                 raise RuntimeError("RTSPストリーム開始に失敗")
@@ -139,6 +240,16 @@ class AutoCaptureSystem:
                 logger.warning(f"照明検出器初期化失敗: {e}")
                 self.lighting_detector = None
             
+            # 保存処理ワーカー開始（cv2.imencode は GIL を解放するためスレッドで並列化可能）
+            # ワーカーは submit() 時に呼び出し元（CPU固定済みの撮影スレッド）から生成され
+            # アフィニティ・スケジューリング方針を継承するため、initializer で元に戻す
+            io_workers = max(1, (os.cpu_count() or 2) // 2)
+            if hasattr(os, 'sched_getaffinity'):
+                self._process_cpu_set = os.sched_getaffinity(0)
+            self._io_executor = ThreadPoolExecutor(max_workers=io_workers,
+                                                   thread_name_prefix="capture-io",
+                                                   initializer=self._init_io_thread)
+            
             # ワーカースレッド開始
             self.is_running = True
             self.capture_thread = threading.Thread(target=self._capture_worker, daemon=True)
@@ -167,6 +278,17 @@ class AutoCaptureSystem:
         if self.motion_thread and self.motion_thread.is_alive():
             self.motion_thread.join(timeout=5.0)
         
+        # 保存待ちの画像を書き出してから停止
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+        
+        # マニフェストを閉じる
+        with self._manifest_lock:
+            if self._manifest_fh:
+                self._manifest_fh.close()
+                self._manifest_fh = None
+        
         # RTSPストリーム停止
         if self.stream:
             self.stream.stop_stream()
@@ -180,6 +302,7 @@ class AutoCaptureSystem:
     def _capture_worker(self):
         """撮影ワーカースレッド"""
         logger.info("撮影ワーカースレッド開始")
+        self._configure_worker_thread(core_slot=-1)
         
         while self.is_running:
             try:
@@ -187,12 +310,15 @@ class AutoCaptureSystem:
                 self._check_scheduled_capture()
                 
                 # キューからの撮影リクエスト処理
-                try:
-                    capture_request = self.capture_queue.get(timeout=1.0)
-                    self._process_capture_request(capture_request)
-                    self.capture_queue.task_done()
-                except queue.Empty:
+                if not self.capture_event.wait(timeout=1.0):
                     continue
+                
+                self.capture_event.clear()
+                while True:
+                    capture_request = self._next_capture_request()
+                    if capture_request is None:
+                        break
+                    self._process_capture_request(capture_request)
                     
             except Exception as e:
                 logger.error(f"撮影ワーカーエラー: {e}")
@@ -208,13 +334,14 @@ class AutoCaptureSystem:
             return
         
         logger.info("動作監視スレッド開始")
+        self._configure_worker_thread(core_slot=-2)
         
         # 背景差分器初期化
         bg_subtractor = cv2.createBackgroundSubtractorMOG2(
             detectShadows=True, varThreshold=50, history=500
         )
         
-        motion_cooldown = 5.0  # 動作検出後のクールダウン時間（秒）
+        motion_cooldown = self.motion_cooldown
         
         while self.is_running:
             try:
@@ -222,8 +349,8 @@ class AutoCaptureSystem:
                     time.sleep(1.0)
                     continue
                 
-                # フレーム取得
-                result = self.stream.get_frame(timeout=2.0)
+                # 最新フレーム取得（処理中に溜まった古いフレームは破棄）
+                result = self.stream.drain_latest(timeout=2.0)
                 if not result or not result[0]:
                     continue
                 
@@ -232,13 +359,13 @@ class AutoCaptureSystem:
                 # 動作検出
                 if self._detect_motion(frame, bg_subtractor):
                     # クールダウンチェック
-                    now = datetime.now()
-                    if (self.last_motion_capture is None or 
-                        (now - self.last_motion_capture).total_seconds() > motion_cooldown):
+                    now_mono = time.monotonic()
+                    if (self._last_motion_mono is None or 
+                        now_mono - self._last_motion_mono > motion_cooldown):
                         
                         logger.info("動作を検出 - 撮影をトリガー")
-                        self.trigger_capture("motion")
-                        self.last_motion_capture = now
+                        self.last_motion_capture = self.trigger_capture("motion")
+                        self._last_motion_mono = now_mono
                         
                         if self.on_motion_callback:
                             self.on_motion_callback(frame)
@@ -249,74 +376,190 @@ class AutoCaptureSystem:
         
         logger.info("動作監視スレッド終了")
     
+    def _configure_worker_thread(self, core_slot: int):
+        """
+        呼び出し元スレッドをCPUコアに固定し SCHED_RR を設定（Linuxのみ）
+        
+        Args:
+            core_slot: 利用可能コア一覧中の位置（-1 で最後のコア）
+        """
+        if not self.pin_worker_threads or not hasattr(os, 'sched_setaffinity'):
+            return
+        
+        try:
+            cores = sorted(os.sched_getaffinity(0))
+            if len(cores) < 2:
+                return
+            core = cores[core_slot]
+            os.sched_setaffinity(0, {core})  # pid 0 = 呼び出し元スレッド
+            logger.info(f"{threading.current_thread().name} をCPU{core}に固定")
+        except (OSError, IndexError) as e:
+            logger.warning(f"CPUアフィニティ設定失敗: {e}")
+            return
+        
+        try:
+            os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(self.worker_rt_priority))
+        except (OSError, AttributeError) as e:
+            # 一般ユーザーでは CAP_SYS_NICE がないため失敗する
+            logger.debug(f"SCHED_RR設定をスキップ: {e}")
+    
+    def _init_io_thread(self):
+        """保存ワーカーのCPU集合と SCHED_OTHER を復元（固定されたスレッドから生成された場合）"""
+        if not self.pin_worker_threads or self._process_cpu_set is None:
+            return
+        
+        try:
+            os.sched_setaffinity(0, self._process_cpu_set)
+        except OSError as e:
+            logger.warning(f"保存ワーカーのCPUアフィニティ復元失敗: {e}")
+        
+        try:
+            os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+        except (OSError, AttributeError) as e:
+            logger.debug(f"保存ワーカーのスケジューリング方針復元をスキップ: {e}")
+    
     def _detect_motion(self, frame: np.ndarray, bg_subtractor) -> bool:
         """動作検出"""
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # ガウシアンブラー適用
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-            
-            # 背景差分
-            fg_mask = bg_subtractor.apply(blurred)
+            scale = max(1, int(self.motion_downscale))
+            h, w = frame.shape[:2]
+            frame_size = (h // scale, w // scale)
+            
+            # フレームサイズ変更時のみバッファを再確保
+            if self._gray_buf is None or self._gray_buf.shape != frame_size:
+                self._small_buf = np.empty(frame_size + (3,), dtype=np.uint8)
+                self._gray_buf = np.empty(frame_size, dtype=np.uint8)
+                self._blur_buf = np.empty(frame_size, dtype=np.uint8)
+                self._fg_buf = np.empty(frame_size, dtype=np.uint8)
+                self._open_buf = np.empty(frame_size, dtype=np.uint8)
+            
+            # 縮小してから輝度化（フル解像度でのBGR→Gray変換を省略）
+            if scale > 1:
+                small = cv2.resize(frame, (frame_size[1], frame_size[0]), dst=self._small_buf,
+                                   interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+            
+            if self.motion_method == "frame_diff":
+                # 3フレーム差分（MOG2の画素毎混合分布更新を省略）
+                fg_mask = self._frame_difference(gray)
+                if fg_mask is None:
+                    return False
+            else:
+                # ガウシアンブラー適用（縮小時は INTER_AREA の平均化分だけカーネルを小さくする）
+                ksize = (5, 5) if scale == 1 else (3, 3)
+                blurred = cv2.GaussianBlur(gray, ksize, 0, dst=self._blur_buf)
+                
+                # 背景差分
+                fg_mask = bg_subtractor.apply(blurred, fgmask=self._fg_buf)
             
             # ノイズ除去
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
+            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self._motion_kernel,
+                                       dst=self._open_buf)
             
-            # 輪郭検出
-            contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # 連結成分解析（面積は stats 配列から一括取得）
+            _, _, stats, _ = cv2.connectedComponentsWithStats(fg_mask, connectivity=8)
+            areas = stats[1:, cv2.CC_STAT_AREA]  # ラベル0は背景
             
-            # ハムスターサイズの物体をフィルタリング
-            motion_detected = False
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                
-                # ハムスターのおおよそのサイズ（ピクセル単位）
-                min_area = 500  # 最小面積
-                max_area = 5000  # 最大面積
-                
-                if min_area <= area <= max_area:
-                    motion_detected = True
-                    break
+            # ハムスターのおおよそのサイズ（等倍ピクセル単位 → 縮小後の面積に換算）
+            area_scale = scale * scale
+            min_area = 500 / area_scale  # 最小面積
+            max_area = 5000 / area_scale  # 最大面積
             
-            return motion_detected
+            # ハムスターサイズの物体をフィルタリング
+            return bool(np.any((areas >= min_area) & (areas <= max_area)))
             
         except Exception as e:
             logger.error(f"動作検出エラー: {e}")
             return False
     
+    def _frame_difference(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        3フレーム差分による前景マスクを計算
+        
+        Returns:
+            前景マスク（履歴が2フレーム揃うまでは None）
+        """
+        prev1, prev2 = self._diff_prev1, self._diff_prev2
+        
+        # 履歴の初期化（フレームサイズ変更時も含む）
+        if prev1 is None or prev1.shape != gray.shape:
+            self._diff_prev1 = gray.copy()
+            self._diff_prev2 = None
+            return None
+        if prev2 is None:
+            self._diff_prev2 = prev1
+            self._diff_prev1 = gray.copy()
+            return None
+        
+        fg_mask = self._fg_buf
+        if NUMBA_AVAILABLE:
+            _frame_diff_kernel(prev2, prev1, gray, fg_mask, self.frame_diff_threshold)
+        else:
+            if self._diff_buf is None or self._diff_buf.shape != gray.shape:
+                self._diff_buf = np.empty_like(gray)
+            cv2.absdiff(gray, prev1, dst=fg_mask)
+            cv2.absdiff(prev1, prev2, dst=self._diff_buf)
+            cv2.min(fg_mask, self._diff_buf, dst=fg_mask)
+            cv2.threshold(fg_mask, self.frame_diff_threshold, 255, cv2.THRESH_BINARY, dst=fg_mask)
+        
+        # 最古フレームのバッファを再利用して履歴を回転
+        np.copyto(prev2, gray)
+        self._diff_prev2, self._diff_prev1 = prev1, prev2
+        
+        return fg_mask
+    
     def _check_scheduled_capture(self):
         """定期撮影チェック"""
         scheduled_enabled = True  # デフォルトで定期撮影を有効
         if not scheduled_enabled:
             return
         
-        now = datetime.now()
-        interval_minutes = 60  # デフォルト60分間隔
+        now_mono = time.monotonic()
+        interval_minutes = self.capture_interval_minutes
         
         # 最後の定期撮影からの経過時間をチェック
-        if (self.last_scheduled_capture is None or 
-            (now - self.last_scheduled_capture).total_seconds() >= interval_minutes * 60):
+        if (self._last_scheduled_mono is None or 
+            now_mono - self._last_scheduled_mono >= interval_minutes * 60):
             
             logger.info("定期撮影時刻に到達")
-            self.trigger_capture("scheduled")
-            self.last_scheduled_capture = now
+            self.last_scheduled_capture = self.trigger_capture("scheduled")
+            self._last_scheduled_mono = now_mono
     
-    def trigger_capture(self, trigger_type: str = "manual", metadata: Optional[Dict] = None):
-        """撮影をトリガー"""
+    def trigger_capture(self, trigger_type: str = "manual", metadata: Optional[Dict] = None) -> datetime:
+        """
+        撮影をトリガー
+        
+        Returns:
+            撮影リクエストのタイムスタンプ
+        """
+        timestamp = datetime.now()
         capture_request = {
             'trigger_type': trigger_type,
-            'timestamp': datetime.now(),
+            'timestamp': timestamp,
             'metadata': metadata or {}
         }
         
-        try:
-            self.capture_queue.put(capture_request, timeout=1.0)
-            logger.debug(f"撮影リクエスト追加: {trigger_type}")
-        except queue.Full:
-            logger.warning("撮影キューが満杯です")
+        with self._queue_lock:
+            if trigger_type == "motion":
+                if self._pending_motion_request is not None:
+                    logger.debug("未処理の動作トリガー撮影を最新のリクエストに置き換えます")
+                self._pending_motion_request = capture_request
+            else:
+                self.capture_queue.append(capture_request)
+        self.capture_event.set()
+        logger.debug(f"撮影リクエスト追加: {trigger_type}")
+        
+        return timestamp
+    
+    def _next_capture_request(self) -> Optional[Dict]:
+        """次の撮影リクエストを取り出す（定期・手動を優先し、最後に最新の動作トリガー）"""
+        with self._queue_lock:
+            if self.capture_queue:
+                return self.capture_queue.popleft()
+            request, self._pending_motion_request = self._pending_motion_request, None
+            return request
     
     def _process_capture_request(self, request: Dict):
         """撮影リクエストを処理"""
@@ -341,15 +584,16 @@ class AutoCaptureSystem:
             quality_score = self._assess_image_quality(frame)
             
             # 品質フィルタリング
-            min_quality = getattr(getattr(self.config, 'data_collection', None), 'quality', {}).get('min_confidence_ratio', 0.8)
+            min_quality = self.min_quality
             if quality_score < min_quality:
                 logger.warning(f"画質が低いため撮影をスキップ: {quality_score:.2f} < {min_quality:.2f}")
-                self._update_stats(False, trigger_type)
+                with self._result_lock:
+                    self._update_stats(False, trigger_type)
                 return
             
             # ファイル保存
             filename = self._generate_filename(timestamp, trigger_type)
-            file_path = self.storage_paths['raw_frames'] / filename
+            file_path = os.path.join(self._raw_frames_dir, filename)
             
             # メタデータ追加
             capture_metadata = {
@@ -357,53 +601,33 @@ class AutoCaptureSystem:
                 'timestamp': timestamp.isoformat(),
                 'quality_score': quality_score,
                 'frame_size': frame.shape,
-                'lighting_mode': None,
                 **metadata
             }
             
-            # 照明条件検出
-            if self.lighting_detector:
-                try:
-                    lighting_result = self.lighting_detector.detect_lighting_mode(frame)
-                    capture_metadata['lighting_mode'] = lighting_result['mode']
-                    capture_metadata['lighting_confidence'] = lighting_result['confidence']
-                except Exception as e:
-                    logger.warning(f"照明検出エラー: {e}")
-            
-            # 画像保存
-            cv2.imwrite(str(file_path), frame)
-            
-            # メタデータファイル保存
-            metadata_path = file_path.with_suffix('.json')
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(capture_metadata, f, ensure_ascii=False, indent=2)
-            
-            # 結果記録
+            # 画像・メタデータ保存・照明条件検出（ワーカーが稼働中なら撮影スレッドをブロックしない）
+            # 結果は書き込み完了後に記録する
             capture_result = CaptureResult(
                 timestamp=timestamp,
                 filename=filename,
-                file_path=str(file_path),
+                file_path=file_path,
                 trigger_type=trigger_type,
                 quality_score=quality_score,
                 metadata=capture_metadata,
                 success=True
             )
-            
-            self.capture_history.append(capture_result)
-            self._update_stats(True, trigger_type, quality_score)
-            
-            # コールバック実行
-            if self.on_capture_callback:
-                self.on_capture_callback(capture_result)
-            
-            logger.info(f"✅ 撮影成功: {filename} (品質: {quality_score:.2f})")
+            if self._io_executor:
+                future = self._io_executor.submit(self._write_capture, frame, file_path,
+                                                  filename, capture_metadata)
+                future.add_done_callback(partial(self._on_write_done, capture_result))
+            else:
+                lighting = self._write_capture(frame, file_path, filename, capture_metadata)
+                self._record_capture(capture_result, lighting)
             
         except Exception as e:
             logger.error(f"❌ 撮影処理エラー: {e}")
-            self._update_stats(False, trigger_type)
             
             # エラー結果記録
-            error_result = CaptureResult(
+            self._record_failure(CaptureResult(
                 timestamp=request['timestamp'],
                 filename="",
                 file_path="",
@@ -412,26 +636,104 @@ class AutoCaptureSystem:
                 metadata=metadata,
                 success=False,
                 error_message=str(e)
-            )
-            
+            ))
+    
+    def _record_capture(self, capture_result: CaptureResult, lighting: Dict):
+        """保存が完了した撮影結果を照明条件付きで記録し、コールバックを実行"""
+        capture_result.metadata = {**capture_result.metadata, **lighting}
+        
+        with self._result_lock:
+            self.capture_history.append(capture_result)
+            self._update_stats(True, capture_result.trigger_type, capture_result.quality_score)
+        
+        # コールバック実行
+        if self.on_capture_callback:
+            self.on_capture_callback(capture_result)
+        
+        logger.info(f"✅ 撮影成功: {capture_result.filename} (品質: {capture_result.quality_score:.2f})")
+    
+    def _record_failure(self, error_result: CaptureResult):
+        """失敗した撮影結果を記録"""
+        with self._result_lock:
             self.capture_history.append(error_result)
+            self._update_stats(False, error_result.trigger_type)
+    
+    def _write_capture(self, frame: np.ndarray, file_path: str, filename: str, metadata: Dict) -> Dict:
+        """
+        画像をJPEGエンコードし、照明条件を付加したメタデータと共に保存
+        
+        metadata は CaptureResult と共有されているため変更せず、マニフェスト用の辞書を別に作る。
+        
+        Returns:
+            照明条件（lighting_mode, lighting_confidence。検出器がない・失敗時は空）
+        """
+        ok, encoded = cv2.imencode('.jpg', frame)
+        if not ok:
+            raise RuntimeError(f"JPEGエンコードに失敗: {file_path}")
+        encoded.tofile(file_path)
+        
+        # 照明条件検出（検出器は履歴を持つため排他実行）
+        lighting = {}
+        if self.lighting_detector:
+            try:
+                with self._lighting_lock:
+                    mode, confidence, _ = self.lighting_detector.detect_mode(frame)
+                lighting = {'lighting_mode': mode, 'lighting_confidence': confidence}
+            except Exception as e:
+                logger.warning(f"照明検出エラー: {e}")
+        
+        # メタデータをマニフェストに追記
+        self._append_manifest({'file': filename, **metadata, **lighting})
+        return lighting
+    
+    def _append_manifest(self, record: Dict):
+        """マニフェスト(JSONL)に1行追記"""
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._manifest_lock:
+            if self._manifest_fh is None:
+                self._manifest_fh = open(self.manifest_path, 'a', encoding='utf-8', buffering=1)
+            self._manifest_fh.write(line)
+    
+    def _on_write_done(self, capture_result: CaptureResult, future):
+        """保存ワーカーの完了コールバック（成功時のみ撮影成功として記録）"""
+        error = future.exception()
+        if error:
+            logger.error(f"❌ 画像保存エラー: {error}")
+            capture_result.success = False
+            capture_result.error_message = str(error)
+            self._record_failure(capture_result)
+            return
+        
+        try:
+            self._record_capture(capture_result, future.result())
+        except Exception as e:
+            logger.error(f"❌ 撮影結果記録エラー: {e}")
     
     def _assess_image_quality(self, frame: np.ndarray) -> float:
         """画像品質を評価"""
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # ブラー検出（ラプラシアン分散）
-            blur_score = cv2.Laplacian(gray, cv2.CV_64F).var()
+            if NUMBA_AVAILABLE and frame.ndim == 3 and frame.dtype == np.uint8:
+                # 1パス融合カーネル（グレースケール+ラプラシアン分散+平均+標準偏差）
+                sum_g, sum_g2, lap_sum, lap_sum2, lap_count = _quality_kernel(frame)
+                n_pixels = frame.shape[0] * frame.shape[1]
+                brightness = sum_g / n_pixels
+                contrast = np.sqrt(max(sum_g2 / n_pixels - brightness * brightness, 0.0))
+                lap_mean = lap_sum / lap_count
+                blur_score = max(lap_sum2 / lap_count - lap_mean * lap_mean, 0.0)
+            else:
+                # グレースケール変換
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                
+                # ブラー検出（ラプラシアン分散、uint8入力なのでFP32で十分な精度）
+                blur_score = float(cv2.Laplacian(gray, cv2.CV_32F).var(dtype=np.float32))
+                brightness = float(gray.mean(dtype=np.float32))
+                contrast = float(gray.std(dtype=np.float32))
             
             # 輝度評価
-            brightness = np.mean(gray)
             brightness_range = [50, 200]  # デフォルト値
             brightness_score = 1.0 - abs(brightness - np.mean(brightness_range)) / 127.5
             
             # コントラスト評価
-            contrast = gray.std()
             contrast_threshold = 0.3 * 255  # デフォルト値
             contrast_score = min(contrast / contrast_threshold, 1.0)
             
@@ -449,8 +751,10 @@ class AutoCaptureSystem:
     
     def _generate_filename(self, timestamp: datetime, trigger_type: str) -> str:
         """ファイル名を生成"""
-        date_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")[:-3]  # ミリ秒まで
-        return f"hamster_{trigger_type}_{date_str}.jpg"
+        # strftime("%Y%m%d_%H%M%S_%f")[:-3] と同じ書式（ミリ秒まで）を整数フォーマットで直接生成
+        ts = timestamp
+        return (f"hamster_{trigger_type}_{ts.year:04d}{ts.month:02d}{ts.day:02d}_"
+                f"{ts.hour:02d}{ts.minute:02d}{ts.second:02d}_{ts.microsecond // 1000:03d}.jpg")
     
     def _update_stats(self, success: bool, trigger_type: str, quality_score: float = 0.0):
         """統計情報を更新"""
@@ -460,27 +764,26 @@ class AutoCaptureSystem:
             self.stats.successful_captures += 1
             self.stats.last_capture_time = datetime.now()
             
-            # 移動平均で品質スコアを更新
-            if self.stats.successful_captures == 1:
-                self.stats.average_quality = quality_score
-            else:
-                alpha = 0.1  # 学習率
-                self.stats.average_quality = (1 - alpha) * self.stats.average_quality + alpha * quality_score
+            # 移動平均で品質スコアを更新（初回は alpha=1.0 で初期値を設定）
+            alpha = 1.0 if self.stats.successful_captures == 1 else 0.1  # 学習率
+            self.stats.average_quality = alpha * quality_score + (1 - alpha) * self.stats.average_quality
         else:
             self.stats.failed_captures += 1
         
-        # トリガータイプ別統計
-        if trigger_type == "motion":
-            self.stats.motion_triggers += 1
-        elif trigger_type == "scheduled":
-            self.stats.scheduled_triggers += 1
-        elif trigger_type == "manual":
-            self.stats.manual_triggers += 1
+        # トリガータイプ別統計（CaptureStats への反映は参照時にまとめて行う）
+        self._trigger_counters[trigger_type] = self._trigger_counters.get(trigger_type, 0) + 1
+    
+    def _sync_trigger_stats(self):
+        """トリガータイプ別カウンタを CaptureStats に反映"""
+        self.stats.motion_triggers = self._trigger_counters.get("motion", 0)
+        self.stats.scheduled_triggers = self._trigger_counters.get("scheduled", 0)
+        self.stats.manual_triggers = self._trigger_counters.get("manual", 0)
     
     def _save_session_report(self):
         """セッションレポートを保存"""
         try:
             # 統計情報のdatetimeオブジェクトを文字列に変換
+            self._sync_trigger_stats()
             stats_dict = asdict(self.stats)
             if 'last_capture_time' in stats_dict and stats_dict['last_capture_time']:
                 stats_dict['last_capture_time'] = stats_dict['last_capture_time'].isoformat()
@@ -490,9 +793,9 @@ class AutoCaptureSystem:
                 'statistics': stats_dict,
                 'capture_history_count': len(self.capture_history),
                 'configuration': {
-                    'capture_interval_minutes': 60,  # デフォルト値
+                    'capture_interval_minutes': self.capture_interval_minutes,
                     'motion_detection_enabled': True,  # デフォルト値
-                    'quality_threshold': 0.8  # デフォルト値
+                    'quality_threshold': self.min_quality
                 }
             }
             
@@ -508,41 +811,93 @@ class AutoCaptureSystem:
     
     def get_stats(self) -> Dict:
         """統計情報を取得"""
+        self._sync_trigger_stats()
         return asdict(self.stats)
     
     def get_recent_captures(self, limit: int = 10) -> List[CaptureResult]:
         """最近の撮影履歴を取得"""
-        return self.capture_history[-limit:]
+        start = max(0, len(self.capture_history) - limit)
+        return list(itertools.islice(self.capture_history, start, None))
     
     def cleanup_old_files(self):
         """古いファイルをクリーンアップ"""
         try:
             now = datetime.now()
-            max_days = 7  # デフォルト値
+            max_days = self.max_storage_days
             cutoff_date = now - timedelta(days=max_days)
             
+            cutoff_ts = cutoff_date.timestamp()
+            
             raw_path = self.storage_paths['raw_frames']
             deleted_count = 0
+            deleted_names = set()
             
-            for file_path in raw_path.glob("hamster_*"):
-                if file_path.stat().st_mtime < cutoff_date.timestamp():
+            # os.scandir はディレクトリ走査時に取得した stat 情報を再利用できる
+            with os.scandir(raw_path) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("hamster_"):
+                        continue
                     try:
-                        file_path.unlink()  # ファイル削除
+                        if entry.stat(follow_symlinks=False).st_mtime >= cutoff_ts:
+                            continue
+                        
+                        os.unlink(entry.path)  # ファイル削除
+                        deleted_names.add(entry.name)
                         
-                        # 対応するメタデータファイルも削除
-                        metadata_path = file_path.with_suffix('.json')
-                        if metadata_path.exists():
-                            metadata_path.unlink()
+                        # 対応するメタデータファイル（旧形式の .json）も削除
+                        if not entry.name.endswith('.json'):
+                            try:
+                                os.unlink(os.path.splitext(entry.path)[0] + '.json')
+                            except FileNotFoundError:
+                                pass
                         
                         deleted_count += 1
+                    except FileNotFoundError:
+                        continue  # 画像と同時に削除済みのメタデータ
                     except Exception as e:
-                        logger.warning(f"ファイル削除エラー: {file_path} - {e}")
+                        logger.warning(f"ファイル削除エラー: {entry.path} - {e}")
             
             if deleted_count > 0:
                 logger.info(f"古いファイルをクリーンアップ: {deleted_count}件削除")
             
+            # 削除した画像のエントリをマニフェストから除去
+            if deleted_names:
+                self._prune_manifest(deleted_names)
+            
         except Exception as e:
             logger.error(f"ファイルクリーンアップエラー: {e}")
+    
+    def _prune_manifest(self, deleted_names: set):
+        """削除済みファイルの行を除いてマニフェストを書き直す（一時ファイル経由で置き換え）"""
+        with self._manifest_lock:
+            # 追記用ハンドルは置き換え前のファイルを指したままになるので閉じる（次回追記時に再オープン）
+            if self._manifest_fh:
+                self._manifest_fh.close()
+                self._manifest_fh = None
+            
+            if not self.manifest_path.exists():
+                return
+            
+            kept = []
+            removed = 0
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        if json.loads(line).get('file') in deleted_names:
+                            removed += 1
+                            continue
+                    except (ValueError, AttributeError):
+                        pass  # 解析できない行はそのまま残す
+                    kept.append(line)
+            
+            if removed == 0:
+                return
+            
+            temp_path = str(self.manifest_path) + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+            os.replace(temp_path, self.manifest_path)
+            logger.info(f"マニフェストから削除済みファイルのエントリを除去: {removed}件")
 
 def main():
     """テスト用メイン関数"""
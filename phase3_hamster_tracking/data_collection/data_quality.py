@@ -14,15 +14,160 @@ from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
+import threading
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # プロジェクトパスを追加
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from phase3_hamster_tracking.utils.hamster_config import HamsterTrackingConfig, load_config
+from phase3_hamster_tracking.utils.numba_compat import NUMBA_AVAILABLE, njit, prange, guvectorize
 
 # ログ設定
 logger = logging.getLogger(__name__)
 
+# 輝度統計ベクトルの並び（_fused_stats / _batch_fused_stats の出力）
+# [輝度和, 輝度二乗和, 暗部画素数, グリッドセル画素数, グリッド別輝度和 (grid*grid)...]
+# ブラーはパッチサンプリングで評価するため、カーネルではステンシル計算を行わない
+_N_BASE_STATS = 4
+
+@njit(fastmath=True, cache=True)
+def _luma_row_stats(gray, i, grid, dark_thr, row_stats, row_cells):
+    """グレースケール画像の i 行目の部分統計を row_stats[i], row_cells[i] に書き込む"""
+    h, w = gray.shape
+    cell_h = h // grid
+    cell_w = w // grid
+    
+    s = 0.0
+    s2 = 0.0
+    dark = 0.0
+    cell_i = i // cell_h if cell_h > 0 else grid
+    for j in range(w):
+        g = np.float64(gray[i, j])
+        s += g
+        s2 += g * g
+        if gray[i, j] < dark_thr:
+            dark += 1.0
+        if cell_i < grid and cell_w > 0:
+            cell_j = j // cell_w
+            if cell_j < grid:
+                row_cells[i, cell_j] += g
+    
+    row_stats[i, 0] = s
+    row_stats[i, 1] = s2
+    row_stats[i, 2] = dark
+
+@njit(cache=True)
+def _reduce_luma_stats(h, w, grid, row_stats, row_cells, out):
+    """行ごとの部分統計を集約して統計ベクトル out に書き込む"""
+    cell_h = h // grid
+    cell_w = w // grid
+    
+    for k in range(_N_BASE_STATS + grid * grid):
+        out[k] = 0.0
+    for i in range(h):
+        for k in range(3):
+            out[k] += row_stats[i, k]
+    
+    out[3] = cell_h * cell_w
+    if cell_h > 0:
+        for i in range(grid * cell_h):
+            for j in range(grid):
+                out[_N_BASE_STATS + (i // cell_h) * grid + j] += row_cells[i, j]
+
+# カーネルは型シグネチャを明示して import 時にコンパイル（初回フレームでの JIT 待ちを無くす）
+# cache=True によりコンパイル結果はディスクにキャッシュされ、2回目以降の起動ではロードのみ
+@njit("float64[::1](uint8[:, ::1], int64, int64)", parallel=True, fastmath=True, cache=True)
+def _fused_stats(gray, grid, dark_thr):
+    """
+    グレースケール画像の品質評価用統計を1パスで計算
+    
+    Args:
+        gray: グレースケール画像 (uint8)
+        grid: 照明一貫性評価のグリッド分割数
+        dark_thr: 暗部とみなす輝度閾値（この値未満を暗部とする）
+        
+    Returns:
+        輝度統計ベクトル（並びは _N_BASE_STATS の説明を参照）
+    """
+    h, w = gray.shape
+    
+    # 行ごとの部分和（prange の競合を避けるため行単位で書き込み、最後に集約）
+    row_stats = np.zeros((h, 3))
+    row_cells = np.zeros((h, grid))
+    for i in prange(h):
+        _luma_row_stats(gray, i, grid, dark_thr, row_stats, row_cells)
+    
+    out = np.empty(_N_BASE_STATS + grid * grid)
+    _reduce_luma_stats(h, w, grid, row_stats, row_cells, out)
+    return out
+
+@guvectorize(["void(uint8[:, :], int64, int64, float64[:], float64[:])"],
+             "(h,w),(),(),(k)->(k)", target="parallel", cache=True)
+def _batch_fused_stats(gray, grid, dark_thr, template, out):
+    """
+    _fused_stats のバッチ版（(N, H, W) のスタックをフレーム単位で並列処理）
+    
+    template は出力ベクトル長 k を与えるためだけの入力で、値は参照しない。
+    """
+    h, w = gray.shape
+    row_stats = np.zeros((h, 3))
+    row_cells = np.zeros((h, grid))
+    for i in range(h):
+        _luma_row_stats(gray, i, grid, dark_thr, row_stats, row_cells)
+    _reduce_luma_stats(h, w, grid, row_stats, row_cells, out)
+
+# OpenCV の 8bit BGR→HSV 変換と同じ固定小数点テーブル（cvtColor と完全一致させるため）
+_HSV_SHIFT = 12
+_HSV_SDIV_TABLE = np.zeros(256, dtype=np.int32)
+_HSV_SDIV_TABLE[1:] = np.round((255 << _HSV_SHIFT) / np.arange(1, 256)).astype(np.int32)
+_HSV_HDIV_TABLE = np.zeros(256, dtype=np.int32)
+_HSV_HDIV_TABLE[1:] = np.round((180 << _HSV_SHIFT) / (6.0 * np.arange(1, 256))).astype(np.int32)
+
+@njit("void(uint8[:, :, ::1], uint8[:, ::1], int32[::1], int32[::1], int32[::1], int32[::1])",
+      parallel=True, cache=True)
+def _hamster_color_mask_kernel(image, mask, sdiv, hdiv, lower, upper):
+    """
+    BGR→HSV 変換と色範囲判定を1パスで行いマスクを生成
+    
+    cv2.cvtColor(COLOR_BGR2HSV) + cv2.inRange と同一の結果を、HSV画像を確保せずに得る。
+    
+    Args:
+        image: BGR画像 (uint8)
+        mask: 出力マスク (uint8, 範囲内=255)
+        sdiv: 彩度除算テーブル
+        hdiv: 色相除算テーブル
+        lower: HSV下限 (H, S, V)
+        upper: HSV上限 (H, S, V)
+    """
+    rows, cols = mask.shape
+    half = 1 << (_HSV_SHIFT - 1)
+    for i in prange(rows):
+        for j in range(cols):
+            b = np.int32(image[i, j, 0])
+            g = np.int32(image[i, j, 1])
+            r = np.int32(image[i, j, 2])
+            v = max(b, g, r)
+            diff = v - min(b, g, r)
+            s = (diff * sdiv[v] + half) >> _HSV_SHIFT
+            
+            if v == r:
+                hue = g - b
+            elif v == g:
+                hue = b - r + 2 * diff
+            else:
+                hue = r - g + 4 * diff
+            hue = (hue * hdiv[diff] + half) >> _HSV_SHIFT
+            if hue < 0:
+                hue += 180
+            
+            if (lower[0] <= hue <= upper[0] and lower[1] <= s <= upper[1]
+                    and lower[2] <= v <= upper[2]):
+                mask[i, j] = 255
+            else:
+                mask[i, j] = 0
+
 class QualityLevel(Enum):
     """品質レベル列挙型"""
     EXCELLENT = "excellent"
@@ -98,6 +243,12 @@ class DataQualityAssessor:
             'saturation_optimal_range': (0.3, 0.8)  # 最適彩度範囲
         }
         
+        # 総合スコアの重み（evaluate_image_quality の scores の並び順に対応）
+        # blur, brightness, contrast, 1-noise, saturation, hamster_visibility,
+        # hamster_size, pose_clarity, background, lighting, 1-shadow
+        self._weights = np.array([0.2, 0.1, 0.1, 0.1, 0.05, 0.25, 0.1, 0.15, 0.03, 0.05, 0.02],
+                                 dtype=np.float64)
+        
         # 品質レベル閾値
         self.level_thresholds = {
             QualityLevel.EXCELLENT: 0.8,
@@ -110,13 +261,66 @@ class DataQualityAssessor:
         # 統計情報
         self.stats = QualityStats()
         
+        # フレーム間で再利用する中間画像バッファ（評価スレッドごとに保持）
+        self._buffers = threading.local()
+        
         # 背景モデル（背景安定性評価用）
         self.background_model = None
-        self.background_frames = []
         self.max_background_frames = 10
+        self.background_frames = deque()
+        self._bg_sum: Optional[np.ndarray] = None  # 窓内フレームの累積和（uint16、257フレームまで桁あふれしない）
+        
+        # ハムスターの一般的な色範囲（HSV、茶色系）
+        # これは品種によって調整が必要
+        self.hamster_hsv_lower = np.array([5, 50, 50], dtype=np.int32)
+        self.hamster_hsv_upper = np.array([25, 255, 255], dtype=np.int32)
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        
+        # ハムスター検出を省略する平均輝度（これ未満は真っ黒、超えると白飛びとみなす）
+        self.blank_frame_brightness_range = (10.0, 245.0)
+        
+        # 照明一貫性評価のグリッド分割数
+        self.lighting_grid_size = 4
+        
+        # 大域的な画質指標を評価する解析解像度の上限幅（閾値はこの解像度基準）
+        self.analysis_max_width = 640
+        
+        # ブラー評価のパッチサンプリング（numba有無に関わらず同じパッチで評価）
+        self.blur_patch_count = 64
+        self.blur_patch_size = 32
+        self.blur_patch_seed = 0
+        self._blur_patch_offsets: Optional[Tuple[Tuple[int, int], np.ndarray]] = None  # (画像サイズ, パッチ位置)
+        
+        # 影判定（LAB の L < 50）と等価なグレースケール閾値
+        # 無彩色では L は輝度に単調なので、gray < 閾値 ⇔ L < 50 となる
+        self.shadow_l_threshold = 50
+        self.shadow_gray_threshold = self._lab_to_gray_threshold(self.shadow_l_threshold)
         
         logger.info("データ品質評価システム初期化完了")
     
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        名前付きの中間バッファを取得（形状・型が変わった場合のみ再確保）
+        
+        OpenCV の dst= に渡して毎フレームの画像確保を避ける。
+        """
+        pool = getattr(self._buffers, 'pool', None)
+        if pool is None:
+            pool = self._buffers.pool = {}
+        
+        buf = pool.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            pool[name] = buf
+        return buf
+    
+    @staticmethod
+    def _lab_to_gray_threshold(l_threshold: int) -> int:
+        """LAB L チャンネル閾値に相当するグレースケール閾値を求める"""
+        ramp = np.repeat(np.arange(256, dtype=np.uint8).reshape(1, 256, 1), 3, axis=2)
+        l_values = cv2.cvtColor(ramp, cv2.COLOR_BGR2LAB)[0, :, 0]
+        return int(np.count_nonzero(l_values < l_threshold))
+    
     def evaluate_image_quality(
         self, 
         image: np.ndarray, 
@@ -135,191 +339,388 @@ class DataQualityAssessor:
             品質評価結果
         """
         try:
-            # 基本品質指標の評価
-            blur_score = self._evaluate_blur(image)
-            brightness_score = self._evaluate_brightness(image)
-            contrast_score = self._evaluate_contrast(image)
-            noise_score = self._evaluate_noise(image)
-            saturation_score = self._evaluate_saturation(image)
-            
-            # ハムスター関連評価
-            hamster_visibility = 0.5  # デフォルト値
-            hamster_size = 0.5
-            pose_clarity = 0.5
-            
-            if detect_hamster:
-                hamster_metrics = self._evaluate_hamster_visibility(image)
-                hamster_visibility = hamster_metrics['visibility_score']
-                hamster_size = hamster_metrics['size_score']
-                pose_clarity = hamster_metrics['pose_clarity']
-            
-            # 背景・環境評価
-            background_stability = self._evaluate_background_stability(image)
-            lighting_consistency = self._evaluate_lighting_consistency(image)
-            shadow_interference = self._evaluate_shadow_interference(image)
-            
-            # 総合スコア計算（重み付き平均）
-            weights = {
-                'blur': 0.2,
-                'brightness': 0.1,
-                'contrast': 0.1,
-                'noise': 0.1,
-                'saturation': 0.05,
-                'hamster_visibility': 0.25,
-                'hamster_size': 0.1,
-                'pose_clarity': 0.15,
-                'background': 0.03,
-                'lighting': 0.05,
-                'shadow': 0.02
-            }
-            
-            overall_score = (
-                blur_score * weights['blur'] +
-                brightness_score * weights['brightness'] +
-                contrast_score * weights['contrast'] +
-                (1.0 - noise_score) * weights['noise'] +  # ノイズは低いほど良い
-                saturation_score * weights['saturation'] +
-                hamster_visibility * weights['hamster_visibility'] +
-                hamster_size * weights['hamster_size'] +
-                pose_clarity * weights['pose_clarity'] +
-                background_stability * weights['background'] +
-                lighting_consistency * weights['lighting'] +
-                (1.0 - shadow_interference) * weights['shadow']  # 影は少ないほど良い
-            )
-            
-            # 品質レベル判定
-            quality_level = self._determine_quality_level(overall_score)
-            
-            # ファイルサイズ取得
-            file_size = None
-            if file_path and os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-            
-            # 評価結果作成
-            metrics = QualityMetrics(
-                blur_score=blur_score,
-                brightness_score=brightness_score,
-                contrast_score=contrast_score,
-                noise_score=noise_score,
-                saturation_score=saturation_score,
-                hamster_visibility_score=hamster_visibility,
-                hamster_size_score=hamster_size,
-                pose_clarity_score=pose_clarity,
-                background_stability_score=background_stability,
-                lighting_consistency_score=lighting_consistency,
-                shadow_interference_score=shadow_interference,
-                overall_score=overall_score,
-                quality_level=quality_level,
-                evaluation_timestamp=datetime.now(),
-                frame_resolution=(image.shape[1], image.shape[0]),
-                file_size_bytes=file_size,
-                notes=self._generate_quality_notes(locals())
-            )
-            
-            # 統計更新
-            self._update_stats(metrics)
-            
-            return metrics
+            frame_scores, gray = self._evaluate_frame(image, detect_hamster)
+            return self._finalize_metrics(frame_scores, gray, image.shape, file_path)
             
         except Exception as e:
             logger.error(f"画像品質評価エラー: {e}")
-            # エラー時のデフォルト評価
-            return QualityMetrics(
-                blur_score=0.0, brightness_score=0.0, contrast_score=0.0,
-                noise_score=1.0, saturation_score=0.0,
-                hamster_visibility_score=0.0, hamster_size_score=0.0, pose_clarity_score=0.0,
-                background_stability_score=0.0, lighting_consistency_score=0.0,
-                shadow_interference_score=1.0,
-                overall_score=0.0, quality_level=QualityLevel.REJECT,
-                evaluation_timestamp=datetime.now(),
-                frame_resolution=(0, 0),
-                notes=[f"評価エラー: {str(e)}"]
+            return self._error_metrics(e)
+    
+    def _evaluate_frame(self, image: np.ndarray, detect_hamster: bool) -> Tuple[Dict[str, float], np.ndarray]:
+        """
+        フレーム単体で決まる指標を評価（背景モデル・統計には触れないので並列実行可）
+        
+        Returns:
+            (フレーム単体の指標, 元解像度グレースケール)
+        """
+        # 大域的な指標は解析解像度まで縮小した画像で評価
+        small = self._downsample_for_metrics(image)
+        gray, small_gray, small_hsv = self._color_planes(image, small)
+        
+        # 輝度系指標（ブラー・輝度・コントラスト・照明一貫性・影）の評価
+        if NUMBA_AVAILABLE:
+            # 融合カーネルで1パス計算
+            luminance = self._evaluate_fused(small_gray)
+            luminance['blur_score'] = self._evaluate_blur(small_gray)
+        else:
+            # 輝度・コントラスト・影は1回のヒストグラム計算から導出
+            luminance = self._evaluate_luminance(small_gray)
+            luminance['blur_score'] = self._evaluate_blur(small_gray)
+            luminance['lighting_consistency'] = self._evaluate_lighting_consistency(small_gray)
+        
+        return self._frame_scores(image, gray, small_hsv, luminance, detect_hamster), gray
+    
+    def _color_planes(
+        self, image: np.ndarray, small: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        評価に使う色空間変換をまとめて実行（フレームごとに1回だけ行い各評価で共有）
+        
+        Returns:
+            (元解像度グレースケール, 解析解像度グレースケール, 解析解像度HSV)
+        """
+        if len(image.shape) != 3:
+            return image, small, None
+        
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY,
+                            dst=self._buffer('gray', image.shape[:2]))
+        small_gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY,
+                                  dst=self._buffer('small_gray', small.shape[:2]))
+        small_hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV,
+                                 dst=self._buffer('small_hsv', small.shape))
+        return gray, small_gray, small_hsv
+    
+    def _compose_metrics(
+        self,
+        image: np.ndarray,
+        gray: np.ndarray,
+        small_hsv: Optional[np.ndarray],
+        luminance: Dict[str, float],
+        file_path: Optional[str],
+        detect_hamster: bool
+    ) -> QualityMetrics:
+        """
+        輝度系指標の評価結果に残りの指標を加えて品質評価結果を組み立てる
+        
+        Args:
+            image: 評価対象画像（元解像度）
+            gray: 元解像度グレースケール
+            small_hsv: 解析解像度HSV（グレースケール入力時は None）
+            luminance: 輝度系指標（_evaluate_fused / _evaluate_luminance の結果）
+            file_path: ファイルパス（ファイルサイズ取得用）
+            detect_hamster: ハムスター検出を行うかどうか
+        """
+        frame_scores = self._frame_scores(image, gray, small_hsv, luminance, detect_hamster)
+        return self._finalize_metrics(frame_scores, gray, image.shape, file_path)
+    
+    def _frame_scores(
+        self,
+        image: np.ndarray,
+        gray: np.ndarray,
+        small_hsv: Optional[np.ndarray],
+        luminance: Dict[str, float],
+        detect_hamster: bool
+    ) -> Dict[str, float]:
+        """
+        輝度系指標にノイズ・彩度・ハムスター関連指標を加える（フレーム単体で決まる指標のみ）
+        
+        Args:
+            image: 評価対象画像（元解像度）
+            gray: 元解像度グレースケール
+            small_hsv: 解析解像度HSV（グレースケール入力時は None）
+            luminance: 輝度系指標（_evaluate_fused / _evaluate_luminance の結果）
+            detect_hamster: ハムスター検出を行うかどうか
+        """
+        scores = dict(luminance)
+        is_color = len(image.shape) == 3
+        
+        # ノイズは縮小時のローパスで消えるため元解像度で評価
+        scores['noise_score'] = self._evaluate_noise(gray)
+        scores['saturation_score'] = self._evaluate_saturation(small_hsv)
+        
+        # ハムスター関連評価
+        hamster_visibility = 0.5  # デフォルト値
+        hamster_size = 0.5
+        pose_clarity = 0.5
+        
+        # 真っ黒・白飛びのフレームはハムスター検出を省略（可視性0として扱う）
+        if detect_hamster and self._is_blank_frame(luminance['mean_brightness']):
+            hamster_visibility = hamster_size = pose_clarity = 0.0
+        elif detect_hamster:
+            hamster_mask = self._hamster_color_mask(image) if is_color else None
+            hamster_metrics = self._evaluate_hamster_visibility(hamster_mask)
+            hamster_visibility = hamster_metrics['visibility_score']
+            hamster_size = hamster_metrics['size_score']
+            pose_clarity = hamster_metrics['pose_clarity']
+        
+        scores['hamster_visibility'] = hamster_visibility
+        scores['hamster_size'] = hamster_size
+        scores['pose_clarity'] = pose_clarity
+        return scores
+    
+    def _finalize_metrics(
+        self,
+        frame_scores: Dict[str, float],
+        gray: np.ndarray,
+        image_shape: Tuple[int, ...],
+        file_path: Optional[str]
+    ) -> QualityMetrics:
+        """
+        背景安定性・総合スコアを求めて品質評価結果を確定し、統計を更新
+        
+        背景モデルと統計の移動平均はフレーム順に依存するため、
+        入力順に1フレームずつ呼び出すこと。
+        
+        Args:
+            frame_scores: _frame_scores の結果
+            gray: 元解像度グレースケール
+            image_shape: 評価対象画像の形状
+            file_path: ファイルパス（ファイルサイズ取得用）
+        """
+        blur_score = frame_scores['blur_score']
+        brightness_score = frame_scores['brightness_score']
+        contrast_score = frame_scores['contrast_score']
+        noise_score = frame_scores['noise_score']
+        saturation_score = frame_scores['saturation_score']
+        hamster_visibility = frame_scores['hamster_visibility']
+        hamster_size = frame_scores['hamster_size']
+        pose_clarity = frame_scores['pose_clarity']
+        lighting_consistency = frame_scores['lighting_consistency']
+        shadow_interference = frame_scores['shadow_interference']
+        
+        # 背景・環境評価
+        background_stability = self._evaluate_background_stability(gray)
+        
+        # 総合スコア計算（重み付き平均）
+        scores = np.array([
+            blur_score,
+            brightness_score,
+            contrast_score,
+            1.0 - noise_score,  # ノイズは低いほど良い
+            saturation_score,
+            hamster_visibility,
+            hamster_size,
+            pose_clarity,
+            background_stability,
+            lighting_consistency,
+            1.0 - shadow_interference  # 影は少ないほど良い
+        ], dtype=np.float64)
+        overall_score = float(np.dot(self._weights, scores))
+        
+        # 品質レベル判定
+        quality_level = self._determine_quality_level(overall_score)
+        
+        # ファイルサイズ取得
+        file_size = None
+        if file_path and os.path.exists(file_path):
+            file_size = os.path.getsize(file_path)
+        
+        # 評価結果作成
+        metrics = QualityMetrics(
+            blur_score=blur_score,
+            brightness_score=brightness_score,
+            contrast_score=contrast_score,
+            noise_score=noise_score,
+            saturation_score=saturation_score,
+            hamster_visibility_score=hamster_visibility,
+            hamster_size_score=hamster_size,
+            pose_clarity_score=pose_clarity,
+            background_stability_score=background_stability,
+            lighting_consistency_score=lighting_consistency,
+            shadow_interference_score=shadow_interference,
+            overall_score=overall_score,
+            quality_level=quality_level,
+            evaluation_timestamp=datetime.now(),
+            frame_resolution=(image_shape[1], image_shape[0]),
+            file_size_bytes=file_size,
+            notes=self._generate_quality_notes(
+                blur_score, brightness_score, contrast_score, noise_score,
+                hamster_visibility, shadow_interference
             )
+        )
+        
+        # 統計更新
+        self._update_stats(metrics)
+        
+        return metrics
+    
+    def _error_metrics(self, error: Exception) -> QualityMetrics:
+        """評価エラー時のデフォルト評価"""
+        return QualityMetrics(
+            blur_score=0.0, brightness_score=0.0, contrast_score=0.0,
+            noise_score=1.0, saturation_score=0.0,
+            hamster_visibility_score=0.0, hamster_size_score=0.0, pose_clarity_score=0.0,
+            background_stability_score=0.0, lighting_consistency_score=0.0,
+            shadow_interference_score=1.0,
+            overall_score=0.0, quality_level=QualityLevel.REJECT,
+            evaluation_timestamp=datetime.now(),
+            frame_resolution=(0, 0),
+            notes=[f"評価エラー: {str(error)}"]
+        )
+    
+    def _downsample_for_metrics(self, image: np.ndarray) -> np.ndarray:
+        """
+        解析解像度までピラミッド縮小
+        
+        幅が analysis_max_width の2倍以上ある間 pyrDown を繰り返す。
+        メインストリーム(2560x1920)では2段、サブストリーム(640x480)では縮小なし。
+        """
+        small = image
+        level = 0
+        while small.shape[1] >= 2 * self.analysis_max_width:
+            shape = ((small.shape[0] + 1) // 2, (small.shape[1] + 1) // 2) + small.shape[2:]
+            small = cv2.pyrDown(small, dst=self._buffer(f'pyramid_{level}', shape))
+            level += 1
+        return small
     
-    def _evaluate_blur(self, image: np.ndarray) -> float:
-        """ブラー検出評価"""
+    def _evaluate_blur(self, gray: np.ndarray) -> float:
+        """
+        ブラー検出評価
+        
+        パッチの総画素数が画像の半分以下になる大きさの画像は、ランダムパッチのみで評価する。
+        融合カーネル経路もこの関数を使うため、numba の有無でスコアは変わらない。
+        """
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            
-            # ラプラシアン分散によるブラー検出
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            sampled = gray.size >= 2 * self.blur_patch_count * (self.blur_patch_size + 2) ** 2
+            if sampled:
+                gray = self._sample_blur_patches(gray)
+            
+            # ラプラシアン（CV_16S で十分な精度）とSobel勾配強度
+            laplacian = cv2.Laplacian(gray, cv2.CV_16S,
+                                      dst=self._buffer('laplacian', gray.shape, np.int16))
+            sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3,
+                                dst=self._buffer('sobel_x', gray.shape, np.float32))
+            sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3,
+                                dst=self._buffer('sobel_y', gray.shape, np.float32))
+            magnitude = cv2.magnitude(sobel_x, sobel_y,
+                                      magnitude=self._buffer('magnitude', gray.shape, np.float32))
+            
+            if sampled:
+                laplacian = self._patch_interior(laplacian)
+                magnitude = self._patch_interior(magnitude)
+            
+            # ラプラシアン分散によるブラー検出（分散は meanStdDev で算出）
+            _, laplacian_std = cv2.meanStdDev(laplacian)
+            laplacian_var = float(laplacian_std[0, 0]) ** 2
             
             # Sobelオペレータによる追加検証
-            sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-            sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-            sobel_magnitude = np.sqrt(sobel_x**2 + sobel_y**2).mean()
-            
-            # 両方の値を正規化して組み合わせ
-            threshold = self.quality_thresholds['blur_threshold']
-            laplacian_score = min(laplacian_var / threshold, 1.0)
-            sobel_score = min(sobel_magnitude / 50.0, 1.0)  # 50は経験的な値
+            sobel_magnitude = cv2.mean(magnitude)[0]
             
-            return (laplacian_score * 0.7 + sobel_score * 0.3)
+            return self._score_blur(laplacian_var, sobel_magnitude)
             
         except Exception as e:
             logger.error(f"ブラー評価エラー: {e}")
             return 0.0
     
-    def _evaluate_brightness(self, image: np.ndarray) -> float:
-        """輝度評価"""
+    def _sample_blur_patches(self, gray: np.ndarray) -> np.ndarray:
+        """
+        ブラー評価用のランダムパッチを縦に連結したモザイク画像を返す
+        
+        各パッチは3x3フィルタ用に1画素の余白付きで切り出し、フィルタ応答は
+        _patch_interior でパッチ内側のみを使う。パッチ位置は固定シードで決め、
+        直近の画像サイズ分のみ保持する（同じ画像には常に同じ評価値を返す）。
+        """
+        size = self.blur_patch_size + 2
+        h, w = gray.shape
+        
+        cached = self._blur_patch_offsets
+        if cached is not None and cached[0] == (h, w):
+            ys, xs = cached[1]
+        else:
+            rng = np.random.default_rng(self.blur_patch_seed)
+            ys = rng.integers(0, h - size + 1, self.blur_patch_count)
+            xs = rng.integers(0, w - size + 1, self.blur_patch_count)
+            self._blur_patch_offsets = ((h, w), (ys, xs))
+        
+        mosaic = self._buffer('blur_mosaic', (self.blur_patch_count * size, size))
+        windows = np.lib.stride_tricks.sliding_window_view(gray, (size, size))
+        mosaic.reshape(-1, size, size)[:] = windows[ys, xs]
+        return mosaic
+    
+    def _patch_interior(self, response: np.ndarray) -> np.ndarray:
+        """モザイク上のフィルタ応答からパッチ境界の余白を除いた画素を取り出す"""
+        size = self.blur_patch_size + 2
+        patches = response.reshape(-1, size, size)[:, 1:-1, 1:-1]
+        return np.ascontiguousarray(patches).reshape(-1, self.blur_patch_size)
+    
+    def _score_blur(self, laplacian_var: float, sobel_magnitude: float) -> float:
+        """ラプラシアン分散とSobel勾配強度からブラースコアを算出"""
+        # 両方の値を正規化して組み合わせ
+        threshold = self.quality_thresholds['blur_threshold']
+        laplacian_score = min(laplacian_var / threshold, 1.0)
+        sobel_score = min(sobel_magnitude / 50.0, 1.0)  # 50は経験的な値
+        
+        return (laplacian_score * 0.7 + sobel_score * 0.3)
+    
+    def _evaluate_luminance(self, gray: np.ndarray) -> Dict[str, float]:
+        """
+        輝度・コントラスト・影の干渉を256ビンの輝度ヒストグラム1回から評価
+        
+        影は LAB の L < 50 と等価なグレースケール閾値未満の画素比率で判定する。
+        
+        Returns:
+            brightness_score, contrast_score, shadow_interference, mean_brightness
+        """
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+            hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+            levels = np.arange(256, dtype=np.float64)
+            total = gray.size
             
-            # 平均輝度
-            mean_brightness = np.mean(gray)
+            # 平均輝度と標準偏差（コントラスト）
+            mean_brightness = float(np.dot(hist, levels)) / total
+            variance = float(np.dot(hist, (levels - mean_brightness) ** 2)) / total
+            contrast = np.sqrt(variance)
             
-            # 理想的な輝度範囲
-            brightness_range = self.quality_thresholds['brightness_range']
-            optimal_brightness = np.mean(brightness_range)
-            
-            # 理想値からの偏差を評価（0-1スケール）
-            deviation = abs(mean_brightness - optimal_brightness) / 127.5
-            score = max(0.0, 1.0 - deviation)
+            # 影の面積比率
+            shadow_ratio = float(hist[:self.shadow_gray_threshold].sum()) / total
             
-            return score
+            return {
+                'brightness_score': self._score_brightness(mean_brightness),
+                'contrast_score': self._score_contrast(contrast),
+                'shadow_interference': self._score_shadow(shadow_ratio),  # 呼び出し側で1.0から引く
+                'mean_brightness': mean_brightness
+            }
             
         except Exception as e:
             logger.error(f"輝度評価エラー: {e}")
-            return 0.0
+            return {
+                'brightness_score': 0.0,
+                'contrast_score': 0.0,
+                'shadow_interference': 0.0,
+                'mean_brightness': None
+            }
     
-    def _evaluate_contrast(self, image: np.ndarray) -> float:
-        """コントラスト評価"""
-        try:
-            # グレースケール変換
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            
-            # 標準偏差によるコントラスト測定
-            contrast = np.std(gray)
-            
-            # RMS（Root Mean Square）コントラストも計算
-            rms_contrast = np.sqrt(np.mean((gray - np.mean(gray))**2))
-            
-            # 閾値との比較
-            threshold = self.quality_thresholds['contrast_threshold'] * 255
-            
-            std_score = min(contrast / threshold, 1.0)
-            rms_score = min(rms_contrast / threshold, 1.0)
-            
-            return (std_score * 0.6 + rms_score * 0.4)
-            
-        except Exception as e:
-            logger.error(f"コントラスト評価エラー: {e}")
-            return 0.0
+    def _score_brightness(self, mean_brightness: float) -> float:
+        """平均輝度から輝度スコアを算出"""
+        # 理想的な輝度範囲
+        brightness_range = self.quality_thresholds['brightness_range']
+        optimal_brightness = np.mean(brightness_range)
+        
+        # 理想値からの偏差を評価（0-1スケール）
+        deviation = abs(mean_brightness - optimal_brightness) / 127.5
+        return max(0.0, 1.0 - deviation)
+    
+    def _score_contrast(self, contrast: float) -> float:
+        """輝度標準偏差からコントラストスコアを算出"""
+        # RMS（Root Mean Square）コントラストは母標準偏差と同値のため std のみで評価
+        threshold = self.quality_thresholds['contrast_threshold'] * 255
+        
+        std_score = min(contrast / threshold, 1.0)
+        rms_score = std_score
+        
+        return (std_score * 0.6 + rms_score * 0.4)
     
-    def _evaluate_noise(self, image: np.ndarray) -> float:
+    def _evaluate_noise(self, gray: np.ndarray) -> float:
         """ノイズ評価"""
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            
             # ガウシアンフィルタ適用
-            filtered = cv2.GaussianBlur(gray, (5, 5), 0)
+            filtered = cv2.GaussianBlur(gray, (5, 5), 0, dst=self._buffer('noise_filtered', gray.shape))
             
-            # 差分からノイズレベルを推定
-            noise = gray.astype(np.float32) - filtered.astype(np.float32)
-            noise_variance = np.var(noise)
+            # 差分からノイズレベルを推定（CV_16S の符号付き差分、分散は meanStdDev で算出）
+            noise = cv2.subtract(gray, filtered, dst=self._buffer('noise_diff', gray.shape, np.int16),
+                                 dtype=cv2.CV_16S)
+            _, noise_std = cv2.meanStdDev(noise)
+            noise_variance = float(noise_std[0, 0]) ** 2
             
             # 正規化（低いほど良い、返り値は高いほど良い形式に変換）
             threshold = self.quality_thresholds['noise_variance_threshold']
@@ -331,15 +732,12 @@ class DataQualityAssessor:
             logger.error(f"ノイズ評価エラー: {e}")
             return 1.0  # エラー時は最大ノイズとして扱う
     
-    def _evaluate_saturation(self, image: np.ndarray) -> float:
+    def _evaluate_saturation(self, hsv: Optional[np.ndarray]) -> float:
         """彩度評価"""
         try:
-            if len(image.shape) != 3:
+            if hsv is None:
                 return 0.5  # グレースケールの場合は中間値
             
-            # HSVに変換
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            
             # 彩度（Saturation）チャンネル
             saturation = hsv[:, :, 1] / 255.0
             mean_saturation = np.mean(saturation)
@@ -364,26 +762,43 @@ class DataQualityAssessor:
             logger.error(f"彩度評価エラー: {e}")
             return 0.5
     
-    def _evaluate_hamster_visibility(self, image: np.ndarray) -> Dict[str, float]:
-        """ハムスター可視性評価"""
+    def _is_blank_frame(self, mean_brightness: Optional[float]) -> bool:
+        """平均輝度から真っ黒・白飛びのフレーム（ハムスター検出不要）かを判定"""
+        if mean_brightness is None:
+            return False
+        low, high = self.blank_frame_brightness_range
+        return mean_brightness < low or mean_brightness > high
+    
+    def _hamster_color_mask(self, image: np.ndarray) -> np.ndarray:
+        """
+        HSV色空間でハムスターらしい色の画素マスクを生成
+        
+        numba 利用時は HSV 画像を経由せず1パスで判定する。
+        """
+        mask = self._buffer('hamster_mask', image.shape[:2])
+        
+        if NUMBA_AVAILABLE:
+            _hamster_color_mask_kernel(np.ascontiguousarray(image), mask, _HSV_SDIV_TABLE, _HSV_HDIV_TABLE,
+                                       self.hamster_hsv_lower, self.hamster_hsv_upper)
+            return mask
+        
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=self._buffer('hsv', image.shape))
+        return cv2.inRange(hsv, self.hamster_hsv_lower, self.hamster_hsv_upper, dst=mask)
+    
+    def _evaluate_hamster_visibility(self, mask: Optional[np.ndarray]) -> Dict[str, float]:
+        """ハムスター可視性評価（入力は _hamster_color_mask の色マスク）"""
         try:
+            if mask is None:
+                raise ValueError("ハムスター検出にはカラー画像が必要です")
+            
             # 簡単なハムスター検出（色とサイズに基づく）
             # より高度な検出はMotionDetectorクラスを使用可能
             
-            # HSV色空間でハムスターらしい色を検出
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            
-            # ハムスターの一般的な色範囲（茶色系）
-            # これは品種によって調整が必要
-            lower_hamster = np.array([5, 50, 50])
-            upper_hamster = np.array([25, 255, 255])
-            
-            mask = cv2.inRange(hsv, lower_hamster, upper_hamster)
-            
             # ノイズ除去
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+            kernel = self._morph_kernel
+            opened = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel,
+                                      dst=self._buffer('hamster_opened', mask.shape))
+            mask = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel, dst=mask)
             
             # 輪郭検出
             contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -397,10 +812,11 @@ class DataQualityAssessor:
             
             # 最大の輪郭を選択
             largest_contour = max(contours, key=cv2.contourArea)
-            area = cv2.contourArea(largest_contour)
+            moments = cv2.moments(largest_contour)
+            area = moments['m00']  # 輪郭のモーメントの m00 は contourArea と一致
             
             # フレーム面積に対する比率
-            frame_area = image.shape[0] * image.shape[1]
+            frame_area = mask.shape[0] * mask.shape[1]
             area_ratio = area / frame_area
             
             # サイズ評価
@@ -423,13 +839,8 @@ class DataQualityAssessor:
             # 可視性スコア（検出された面積に基づく）
             visibility_score = min(1.0, area_ratio * 10)  # 10は調整可能な係数
             
-            # 姿勢明瞭性（輪郭の複雑さから推定）
-            perimeter = cv2.arcLength(largest_contour, True)
-            if perimeter > 0 and area > 0:
-                compactness = 4 * np.pi * area / (perimeter * perimeter)
-                pose_clarity = min(1.0, compactness * 2)  # ある程度コンパクトな方が良い
-            else:
-                pose_clarity = 0.0
+            # 姿勢明瞭性（等価楕円の離心率から推定、丸くまとまった姿勢ほど高い）
+            pose_clarity = self._pose_clarity_from_moments(moments)
             
             return {
                 'visibility_score': max(0.0, min(1.0, visibility_score)),
@@ -445,28 +856,66 @@ class DataQualityAssessor:
                 'pose_clarity': 0.0
             }
     
-    def _evaluate_background_stability(self, image: np.ndarray) -> float:
+    @staticmethod
+    def _pose_clarity_from_moments(moments: Dict[str, float]) -> float:
+        """
+        輪郭モーメントの等価楕円から姿勢明瞭性を算出
+        
+        2次中心モーメントの固有値 λ1 >= λ2 から等価楕円の短軸/長軸比
+        sqrt(λ2/λ1)（= sqrt(1 - 離心率^2)）を求める。
+        従来のコンパクト度と同様、ある程度まとまっていれば満点とするため2倍して上限1とする
+        （円・2:1楕円=1.0、4:1楕円=0.5）。
+        """
+        area = moments['m00']
+        if area <= 0:
+            return 0.0
+        
+        mu20 = moments['mu20'] / area
+        mu02 = moments['mu02'] / area
+        mu11 = moments['mu11'] / area
+        
+        common = np.sqrt(4 * mu11 ** 2 + (mu20 - mu02) ** 2)
+        major = mu20 + mu02 + common
+        minor = mu20 + mu02 - common
+        if major <= 0:
+            return 0.0
+        
+        axis_ratio = np.sqrt(max(0.0, minor / major))
+        return float(min(1.0, axis_ratio * 2))
+    
+    def _evaluate_background_stability(self, gray: np.ndarray) -> float:
         """背景安定性評価"""
         try:
-            # 背景フレームを蓄積
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            
+            # 解像度が変わった場合は背景モデルを作り直す
+            if self._bg_sum is None or self._bg_sum.shape != gray.shape:
+                self.background_frames.clear()
+                self._bg_sum = np.zeros(gray.shape, dtype=np.uint16)
+                self.background_model = np.zeros(gray.shape, dtype=np.uint8)
+            
+            # 背景フレームを蓄積（累積和を加減算で更新）
+            # gray は再利用バッファのため窓にはコピーを保持する
             if len(self.background_frames) < self.max_background_frames:
-                self.background_frames.append(gray)
+                self.background_frames.append(gray.copy())
+                cv2.add(self._bg_sum, gray, dst=self._bg_sum, dtype=cv2.CV_16U)
                 return 0.5  # 初期段階は中間値
             else:
-                # 古いフレームを削除して新しいフレームを追加
-                self.background_frames.pop(0)
-                self.background_frames.append(gray)
+                # 古いフレームを削除し、そのバッファに新しいフレームを書き込んで再利用
+                oldest = self.background_frames.popleft()
+                cv2.subtract(self._bg_sum, oldest, dst=self._bg_sum, dtype=cv2.CV_16U)
+                np.copyto(oldest, gray)
+                self.background_frames.append(oldest)
+                cv2.add(self._bg_sum, gray, dst=self._bg_sum, dtype=cv2.CV_16U)
             
-            # 背景モデル更新
-            self.background_model = np.mean(self.background_frames, axis=0).astype(np.uint8)
+            # 背景モデル更新（累積和 / N を uint8 に丸めて直接書き込み）
+            cv2.convertScaleAbs(self._bg_sum, dst=self.background_model,
+                                alpha=1.0 / len(self.background_frames))
             
             # 現在のフレームと背景モデルの差分
-            diff = cv2.absdiff(gray, self.background_model)
+            diff = cv2.absdiff(gray, self.background_model, dst=self._buffer('background_diff', gray.shape))
             
             # 変化の度合いを評価
-            change_ratio = np.sum(diff > 30) / diff.size  # 30は閾値
+            changed = cv2.compare(diff, 30, cv2.CMP_GT, dst=diff)  # 30は閾値
+            change_ratio = cv2.countNonZero(changed) / diff.size
             
             # 安定性スコア（変化が少ないほど高い）
             stability_score = 1.0 - min(change_ratio * 5, 1.0)  # 5は調整係数
@@ -477,59 +926,67 @@ class DataQualityAssessor:
             logger.error(f"背景安定性評価エラー: {e}")
             return 0.5
     
-    def _evaluate_lighting_consistency(self, image: np.ndarray) -> float:
+    def _evaluate_lighting_consistency(self, gray: np.ndarray) -> float:
         """照明一貫性評価"""
         try:
-            # グレースケール変換
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            
             # 画像をグリッドに分割して局所的な輝度を分析
             h, w = gray.shape
-            grid_size = 4  # 4x4グリッド
+            grid_size = self.lighting_grid_size  # 4x4グリッド
             cell_h, cell_w = h // grid_size, w // grid_size
             
-            local_means = []
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    y1, y2 = i * cell_h, min((i + 1) * cell_h, h)
-                    x1, x2 = j * cell_w, min((j + 1) * cell_w, w)
-                    cell_mean = np.mean(gray[y1:y2, x1:x2])
-                    local_means.append(cell_mean)
-            
-            # 局所輝度の分散を計算
-            mean_variance = np.var(local_means)
-            
-            # 一貫性スコア（分散が小さいほど一貫性が高い）
-            consistency_score = 1.0 / (1.0 + mean_variance / 100.0)  # 100は正規化係数
+            # 割り切れる領域を INTER_AREA で縮小するとセルごとのブロック平均になる
+            cropped = gray[:cell_h * grid_size, :cell_w * grid_size]
+            local_means = cv2.resize(cropped, (grid_size, grid_size), interpolation=cv2.INTER_AREA)
             
-            return min(1.0, consistency_score)
+            return self._score_lighting_consistency(local_means.astype(np.float32))
             
         except Exception as e:
             logger.error(f"照明一貫性評価エラー: {e}")
             return 0.5
     
-    def _evaluate_shadow_interference(self, image: np.ndarray) -> float:
-        """影の干渉評価"""
-        try:
-            # LAB色空間に変換
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l_channel = lab[:, :, 0]
-            
-            # 極端に暗い領域を検出（影の可能性）
-            dark_threshold = 50  # L*値が50以下
-            dark_mask = l_channel < dark_threshold
-            
-            # 影の面積比率
-            shadow_ratio = np.sum(dark_mask) / dark_mask.size
-            
-            # 影の干渉スコア（高いほど影が多い）
-            interference_score = min(shadow_ratio * 3, 1.0)  # 3は調整係数
-            
-            return interference_score  # 呼び出し側で1.0から引く
-            
-        except Exception as e:
-            logger.error(f"影干渉評価エラー: {e}")
-            return 0.0
+    def _score_lighting_consistency(self, local_means) -> float:
+        """グリッド別平均輝度から照明一貫性スコアを算出"""
+        # 局所輝度の分散を計算
+        mean_variance = float(np.var(local_means))
+        
+        # 一貫性スコア（分散が小さいほど一貫性が高い）
+        consistency_score = 1.0 / (1.0 + mean_variance / 100.0)  # 100は正規化係数
+        
+        return min(1.0, consistency_score)
+    
+    def _score_shadow(self, shadow_ratio: float) -> float:
+        """暗部面積比率から影の干渉スコアを算出（高いほど影が多い）"""
+        return min(shadow_ratio * 3, 1.0)  # 3は調整係数
+    
+    def _evaluate_fused(self, gray: np.ndarray) -> Dict[str, float]:
+        """
+        輝度系指標（輝度・コントラスト・照明一貫性・影）を融合カーネルで一括評価
+        
+        ブラーは両経路共通の _evaluate_blur で別途評価する。
+        
+        Returns:
+            各指標のスコア
+        """
+        stats = _fused_stats(np.ascontiguousarray(gray), self.lighting_grid_size, self.shadow_gray_threshold)
+        return self._score_luma_stats(stats, gray.size)
+    
+    def _score_luma_stats(self, stats: np.ndarray, n_pixels: int) -> Dict[str, float]:
+        """融合カーネルの輝度統計ベクトルから輝度系指標のスコアを算出"""
+        grid = self.lighting_grid_size
+        total, total_sq, dark_count, cell_pixels = stats[:_N_BASE_STATS]
+        cell_sums = stats[_N_BASE_STATS:_N_BASE_STATS + grid * grid]
+        
+        mean_brightness = total / n_pixels
+        contrast = np.sqrt(max(total_sq / n_pixels - mean_brightness ** 2, 0.0))
+        local_means = cell_sums / cell_pixels if cell_pixels > 0 else np.full(grid * grid, mean_brightness)
+        
+        return {
+            'brightness_score': self._score_brightness(mean_brightness),
+            'contrast_score': self._score_contrast(contrast),
+            'lighting_consistency': self._score_lighting_consistency(local_means),
+            'shadow_interference': self._score_shadow(dark_count / n_pixels),
+            'mean_brightness': mean_brightness
+        }
     
     def _determine_quality_level(self, overall_score: float) -> QualityLevel:
         """総合スコアから品質レベルを判定"""
@@ -544,27 +1001,35 @@ class DataQualityAssessor:
         else:
             return QualityLevel.REJECT
     
-    def _generate_quality_notes(self, eval_vars: Dict) -> List[str]:
+    def _generate_quality_notes(
+        self,
+        blur_score: float,
+        brightness_score: float,
+        contrast_score: float,
+        noise_score: float,
+        hamster_visibility: float,
+        shadow_interference: float
+    ) -> List[str]:
         """品質評価に基づく注意事項を生成"""
         notes = []
         
         # 各指標に基づく注意事項
-        if eval_vars.get('blur_score', 0) < 0.5:
+        if blur_score < 0.5:
             notes.append("画像がぼやけています")
         
-        if eval_vars.get('brightness_score', 0) < 0.5:
+        if brightness_score < 0.5:
             notes.append("輝度が不適切です")
         
-        if eval_vars.get('contrast_score', 0) < 0.5:
+        if contrast_score < 0.5:
             notes.append("コントラストが不足しています")
         
-        if eval_vars.get('noise_score', 0) > 0.7:
+        if noise_score > 0.7:
             notes.append("ノイズが多く含まれています")
         
-        if eval_vars.get('hamster_visibility', 0) < 0.3:
+        if hamster_visibility < 0.3:
             notes.append("ハムスターの可視性が低いです")
         
-        if eval_vars.get('shadow_interference', 0) > 0.5:
+        if shadow_interference > 0.5:
             notes.append("影の干渉が検出されました")
         
         return notes
@@ -601,17 +1066,62 @@ class DataQualityAssessor:
             self.stats.average_brightness_score = (1 - alpha) * self.stats.average_brightness_score + alpha * metrics.brightness_score
             self.stats.average_contrast_score = (1 - alpha) * self.stats.average_contrast_score + alpha * metrics.contrast_score
     
+    def _evaluate_file_frame(
+        self, image_path: str
+    ) -> Optional[Tuple[Dict[str, float], np.ndarray, Tuple[int, ...]]]:
+        """
+        画像ファイルを読み込んでフレーム単体の指標を評価（読み込み失敗時は None）
+        
+        Returns:
+            (フレーム単体の指標, 元解像度グレースケール, 画像形状)
+        """
+        image = cv2.imread(image_path)
+        if image is None:
+            return None
+        frame_scores, gray = self._evaluate_frame(image, detect_hamster=True)
+        # グレースケールはスレッドごとの作業バッファなので、次のフレームで上書きされる前にコピー
+        return frame_scores, gray.copy(), image.shape
+    
+    def _classify_file(self, image_path: str, future, filtered_results: Dict[str, List[str]]) -> None:
+        """並列評価の結果を受け取り、順序依存の評価を確定して品質レベル別に分類"""
+        try:
+            frame = future.result()
+            if frame is None:
+                logger.warning(f"画像読み込み失敗: {image_path}")
+                filtered_results['rejected'].append(image_path)
+                return
+            
+            frame_scores, gray, image_shape = frame
+            metrics = self._finalize_metrics(frame_scores, gray, image_shape, image_path)
+            
+            # 品質レベル別に分類
+            level_key = metrics.quality_level.value
+            filtered_results[level_key].append(image_path)
+            
+            logger.debug(f"画像評価完了: {image_path} -> {metrics.quality_level.value} "
+                       f"(スコア: {metrics.overall_score:.2f})")
+            
+        except Exception as e:
+            logger.error(f"画像フィルタリングエラー: {image_path} - {e}")
+            filtered_results['rejected'].append(image_path)
+    
     def filter_by_quality(
         self, 
         image_paths: List[str], 
-        min_quality_level: QualityLevel = QualityLevel.ACCEPTABLE
+        min_quality_level: QualityLevel = QualityLevel.ACCEPTABLE,
+        max_workers: Optional[int] = None
     ) -> Dict[str, List[str]]:
         """
         品質レベルに基づいて画像をフィルタリング
         
+        画像の読み込みとフレーム単体の指標評価はスレッドプールで並列実行し
+        （OpenCV の処理中は GIL が解放される）、背景安定性・統計など
+        フレーム順に依存する評価は呼び出しスレッドで入力順に1枚ずつ行う。
+        
         Args:
             image_paths: 画像ファイルパスのリスト
             min_quality_level: 最小品質レベル
+            max_workers: 並列ワーカー数（None の場合は CPU コア数）
             
         Returns:
             品質レベル別の画像パスディクショナリ
@@ -626,30 +1136,79 @@ class DataQualityAssessor:
         
         min_score = self.level_thresholds[min_quality_level]
         
-        for image_path in image_paths:
+        workers = max_workers or os.cpu_count() or 1
+        
+        # 先読みするフレーム数の上限（評価待ちのグレースケール画像を溜め込みすぎないため）
+        window = workers * 2
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quality-eval") as executor:
+            pending = deque()
+            for image_path in image_paths:
+                pending.append((image_path, executor.submit(self._evaluate_file_frame, image_path)))
+                if len(pending) >= window:
+                    self._classify_file(*pending.popleft(), filtered_results)
+            
+            # 結果は入力順に確定
+            while pending:
+                self._classify_file(*pending.popleft(), filtered_results)
+        
+        return filtered_results
+    
+    def evaluate_image_stack(
+        self,
+        frames: np.ndarray,
+        detect_hamster: bool = True
+    ) -> List[QualityMetrics]:
+        """
+        同一解像度のフレーム群 (N, H, W, 3) をまとめて品質評価
+        
+        データセット整理などで画像を事前に読み込んである場合向け。
+        輝度系指標の統計は全フレーム分を1回のバッチカーネル呼び出しで並列計算し、
+        背景安定性など順序に依存する指標はフレーム順に評価する。
+        
+        Args:
+            frames: BGRフレームのスタック (uint8)
+            detect_hamster: ハムスター検出を行うかどうか
+            
+        Returns:
+            フレーム順の品質評価結果リスト
+        """
+        if not NUMBA_AVAILABLE or frames.ndim != 4 or len(frames) == 0:
+            return [self.evaluate_image_quality(frame, detect_hamster=detect_hamster) for frame in frames]
+        
+        try:
+            # 解析解像度のフレームとグレースケールをスタックに格納
+            first = self._downsample_for_metrics(frames[0])
+            small_stack = np.empty((len(frames),) + first.shape, dtype=np.uint8)
+            small_gray_stack = np.empty((len(frames),) + first.shape[:2], dtype=np.uint8)
+            for n, frame in enumerate(frames):
+                small_stack[n] = self._downsample_for_metrics(frame)
+                cv2.cvtColor(small_stack[n], cv2.COLOR_BGR2GRAY, dst=small_gray_stack[n])
+            
+            # 輝度統計をバッチで一括計算
+            grid = self.lighting_grid_size
+            template = np.empty(_N_BASE_STATS + grid * grid)
+            stats = _batch_fused_stats(small_gray_stack, grid, self.shadow_gray_threshold, template)
+            
+        except Exception as e:
+            logger.error(f"バッチ品質評価エラー: {e} - フレーム単位の評価にフォールバック")
+            return [self.evaluate_image_quality(frame, detect_hamster=detect_hamster) for frame in frames]
+        
+        results = []
+        n_pixels = small_gray_stack[0].size
+        for n, frame in enumerate(frames):
             try:
-                # 画像読み込み
-                image = cv2.imread(image_path)
-                if image is None:
-                    logger.warning(f"画像読み込み失敗: {image_path}")
-                    filtered_results['rejected'].append(image_path)
-                    continue
-                
-                # 品質評価
-                metrics = self.evaluate_image_quality(image, image_path)
-                
-                # 品質レベル別に分類
-                level_key = metrics.quality_level.value
-                filtered_results[level_key].append(image_path)
-                
-                logger.debug(f"画像評価完了: {image_path} -> {metrics.quality_level.value} "
-                           f"(スコア: {metrics.overall_score:.2f})")
-                
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._buffer('gray', frame.shape[:2]))
+                small_hsv = cv2.cvtColor(small_stack[n], cv2.COLOR_BGR2HSV,
+                                         dst=self._buffer('small_hsv', small_stack[n].shape))
+                luminance = self._score_luma_stats(stats[n], n_pixels)
+                luminance['blur_score'] = self._evaluate_blur(small_gray_stack[n])
+                results.append(self._compose_metrics(frame, gray, small_hsv, luminance, None, detect_hamster))
             except Exception as e:
-                logger.error(f"画像フィルタリングエラー: {image_path} - {e}")
-                filtered_results['rejected'].append(image_path)
+                logger.error(f"画像品質評価エラー: {e}")
+                results.append(self._error_metrics(e))
         
-        return filtered_results
+        return results
     
     def get_stats(self) -> Dict:
         """統計情報を取得"""
@@ -10,16 +10,18 @@ import sys
 import cv2
 import numpy as np
 import time
-from datetime import datetime, timedelta
+import math
+from datetime import datetime
 from typing import List, Tuple, Optional, Dict, Callable
-from dataclasses import dataclass, asdict
-from collections import deque
+from dataclasses import dataclass
 import logging
 
 # プロジェクトパスを追加
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from phase3_hamster_tracking.utils.hamster_config import HamsterTrackingConfig, load_config
 from phase3_hamster_tracking.hamster_tracking.coordinate_calibrator import CoordinateCalibrator
+from phase3_hamster_tracking.utils.numba_compat import NUMBA_AVAILABLE
+from phase3_hamster_tracking.data_collection._motion_kernels import fused_detect
 
 # ログ設定
 logger = logging.getLogger(__name__)
@@ -35,7 +37,7 @@ class MotionEvent:
     confidence: float
     motion_type: str  # "small", "medium", "large", "rapid", "slow"
     bounding_box: Tuple[int, int, int, int]  # x, y, width, height
-    contours: List[np.ndarray]
+    contours: np.ndarray  # 輪郭点 (N, 2) int16（フル解像度の画素座標）
 
 @dataclass
 class MotionStats:
@@ -52,6 +54,11 @@ class MotionStats:
 class MotionDetector:
     """高精度動作検出システム"""
     
+    # 動作タイプ（同一オブジェクトを返すため比較は参照比較で済む）
+    MOTION_RAPID = sys.intern("rapid")
+    MOTION_MEDIUM = sys.intern("medium")
+    MOTION_SLOW = sys.intern("slow")
+    
     def __init__(self, config: Optional[HamsterTrackingConfig] = None):
         """
         動作検出システムを初期化
@@ -68,16 +75,53 @@ class MotionDetector:
             logger.warning(f"座標校正器初期化失敗: {e}")
             self.calibrator = None
         
-        # 背景差分器設定
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows=True,
-            varThreshold=50,
-            history=500
-        )
-        
         # フィルタ設定
-        self.morphology_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        self.gaussian_kernel_size = 5
+        # 矩形SEは分離可能（行・列方向の1次元演算）なため OpenCV の高速経路で処理される
+        self.morphology_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self.mask_close_enabled = True  # False でクロージング（穴埋め）を省略しオープニングのみ
+        
+        # 処理解像度（pyrDown 1段でガウシアン平滑化と1/2縮小を同時に行う）
+        self.processing_scale = 2
+        
+        # 背景モデル（running_mean: 単一個体・固定ケージ向けの移動平均背景）
+        self.bg_method = "running_mean" if self.config.motion.simple_bg else self.config.motion.subtractor
+        if self.bg_method not in ("mog2", "knn", "running_mean"):
+            logger.warning(f"未知の背景差分方式 '{self.bg_method}' - mog2 を使用します")
+            self.bg_method = "mog2"
+        self.use_simple_bg = self.bg_method == "running_mean"
+        self.bg_learning_rate = self.config.motion.bg_learning_rate
+        self.bg_diff_threshold = self.config.motion.bg_diff_threshold
+        self._bg_average: Optional[np.ndarray] = None
+        self._bg_u8: Optional[np.ndarray] = None
+        
+        # numba融合カーネル（グレースケール化〜二値化を1パス、移動平均背景時のみ）
+        self.use_numba_kernel = self.use_simple_bg and self.config.motion.use_numba and NUMBA_AVAILABLE
+        if self.config.motion.use_numba and not self.use_numba_kernel:
+            logger.warning("numba融合カーネルは running_mean かつ numba 導入時のみ有効です - OpenCV処理を使用します")
+        
+        # CUDA対応（MOG2のみ。利用可能ならフレームをGPU上に保持したまま背景差分まで処理）
+        self.use_cuda = self.bg_method == "mog2" and self._cuda_available()
+        if self.use_cuda:
+            self._init_cuda_pipeline()
+        
+        # 背景差分器設定
+        # 影判定（マスク値127）は後段で前景と同じ扱いになるため既定で無効化し、画素あたりの処理を削減。
+        # 有効化した場合は影画素をマスクから除外する（MOG2/KNN共通）
+        self.mog2_detect_shadows = False
+        self.bg_subtractor = self._create_bg_subtractor()
+        self._last_processed: Optional[np.ndarray] = None  # リセット時の再初期化に使う直近の処理フレーム
+        
+        # 静止フレームゲート（縮小フレームと背景サムネイルの差分が小さければ背景差分以降を省略）
+        motion_config = self.config.motion
+        self.motion_gate_enabled = motion_config.gate_enabled
+        self.motion_gate_size = (80, 45)        # 差分判定用の縮小サイズ (幅, 高さ)
+        self.motion_gate_noise_level = motion_config.gate_noise_level
+        self.motion_gate_min_area_fraction = motion_config.gate_min_area_fraction
+        self.motion_gate_refresh_frames = motion_config.gate_refresh_frames
+        self.motion_gate_warmup_frames = motion_config.gate_warmup_frames
+        self._gate_bg: Optional[np.ndarray] = None  # 縮小背景（float32の移動平均）
+        self._gate_skipped_frames = 0
+        self._bg_frames_seen = 0
         
         # ハムスター検出パラメータ
         self.hamster_size_range = {
@@ -87,10 +131,38 @@ class MotionDetector:
             'max_aspect_ratio': 3.0   # 最大アスペクト比
         }
         
+        # 信頼度・動作分類の定数（フレームごとの再計算を避ける）
+        self._ideal_area = 0.5 * (self.hamster_size_range['min_area_px'] + self.hamster_size_range['max_area_px'])
+        self._inv_ideal_area = 1.0 / self._ideal_area
+        self._v_thresh_mm = (50.0, 100.0)  # (medium下限, rapid下限) mm/sec
+        self._v_thresh_px = (20.0, 50.0)   # (medium下限, rapid下限) pixel/sec
+        
+        # 輪郭数がこれを超えるフレームは面積上位の輪郭のみ検査
+        self.max_contours_full_scan = 200
+        self.top_contours_on_overflow = 20
+        
+        # 形状チェック: 頂点数の多い輪郭は凸包充実度の代わりに外接矩形充填率で判定
+        self._use_hull_solidity = False   # True で常に凸包充実度を使用（デバッグ用）
+        self.hull_max_points = 30         # これ未満の頂点数なら凸包充実度で判定
+        self.min_solidity = 0.5
+        self.min_extent = 0.35            # 楕円状の個体は通過、細長い影の筋は除外
+        
         # 動作追跡
-        self.motion_history: deque = deque(maxlen=30)  # 最大30フレーム分
+        # 動作履歴（最大30フレーム分、フィールドごとのリングバッファ）
+        self.motion_history_size = 30
+        self._hist_ts = np.full(self.motion_history_size, -np.inf, dtype=np.float64)  # time.monotonic() 秒（未記録は-inf）
+        self._hist_cnt = np.zeros(self.motion_history_size, dtype=np.int32)
+        self._hist_vmax = np.zeros(self.motion_history_size, dtype=np.float32)
+        self._hist_idx = 0
         self.last_position: Optional[Tuple[int, int]] = None
-        self.velocity_history: deque = deque(maxlen=10)
+        self._frame_index = 0            # detect_motion の呼び出し回数（ゲートで省略したフレームも含む）
+        self._last_position_frame = 0    # last_position を記録したフレーム番号
+        
+        # 速度履歴（mm/sec、最大10件のリングバッファ）
+        self.velocity_history_size = 10
+        self._vel_hist = np.zeros(self.velocity_history_size, dtype=np.float32)
+        self._vel_idx = 0
+        self._vel_len = 0
         
         # 統計情報
         self.stats = MotionStats(session_start=datetime.now())
@@ -102,6 +174,7 @@ class MotionDetector:
         # 状態管理
         self.current_activity_state = "unknown"
         self.last_activity_change = datetime.now()
+        self._last_activity_change_mono = time.monotonic()  # 内部の経過時間計算用
         self.activity_threshold_mm_min = 100.0  # デフォルト値
         self.rest_threshold_sec = 300  # デフォルト値（5分）
         
@@ -120,35 +193,23 @@ class MotionDetector:
         """
         if timestamp is None:
             timestamp = datetime.now()
+        self._frame_index += 1
         
         try:
-            # 前処理
-            processed_frame = self._preprocess_frame(frame)
-            
-            # 背景差分
-            fg_mask = self.bg_subtractor.apply(processed_frame)
-            
-            # ノイズ除去
-            fg_mask = self._clean_mask(fg_mask)
-            
-            # 輪郭検出
-            contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # ハムスター候補をフィルタリング
-            hamster_contours = self._filter_hamster_contours(contours)
+            # 静止フレームは背景差分・輪郭処理を省略（統計と活動状態の評価は継続）
+            if self._is_static_frame(frame):
+                motion_events = []
+            else:
+                motion_events = self._detect_motion_events(frame, timestamp)
             
-            # 動作イベント生成
-            motion_events = []
-            for contour in hamster_contours:
-                event = self._create_motion_event(contour, timestamp, frame.shape)
-                if event:
-                    motion_events.append(event)
+            # 内部の時間計算は単調増加の秒数で行う（datetime は公開値のみ）
+            now = time.monotonic()
             
             # 統計更新
-            self._update_stats(motion_events)
+            self._update_stats(motion_events, now)
             
             # 活動状態評価
-            self._evaluate_activity_state(motion_events, timestamp)
+            self._evaluate_activity_state(motion_events, timestamp, now)
             
             # コールバック実行
             for event in motion_events:
@@ -161,6 +222,206 @@ class MotionDetector:
             logger.error(f"動作検出エラー: {e}")
             return []
     
+    def _detect_motion_events(self, frame: np.ndarray, timestamp: datetime) -> List[MotionEvent]:
+        """背景差分から動作イベントを生成"""
+        self._bg_frames_seen += 1
+        
+        if self.use_cuda:
+            # 前処理〜ノイズ除去までGPU上で実行し、最終マスクのみダウンロード
+            fg_mask = self._foreground_mask_cuda(frame)
+        elif self.use_numba_kernel and len(frame.shape) == 3:
+            # 前処理〜背景差分〜二値化を1パスで実行
+            fg_mask = self._clean_mask(self._fused_foreground(frame))
+        else:
+            # 前処理
+            processed_frame = self._preprocess_frame(frame)
+            self._last_processed = processed_frame
+            
+            # 背景差分
+            if self.use_simple_bg:
+                fg_mask = self._running_average_foreground(processed_frame)
+            else:
+                fg_mask = self.bg_subtractor.apply(processed_frame)
+                if self.mog2_detect_shadows:
+                    cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY, dst=fg_mask)
+            
+            # ノイズ除去
+            fg_mask = self._clean_mask(fg_mask)
+        
+        # 連結成分ラベリング（面積・外接矩形・重心を1パスで取得）
+        _, labels, stats, centroids = cv2.connectedComponentsWithStats(fg_mask, connectivity=8)
+        
+        # ハムスター候補をフィルタリング（縮小解像度のまま判定、ラベル0は背景）
+        candidates, extents = self._filter_hamster_components(stats[1:])
+        
+        # 動作イベント生成（外部APIはフル解像度の画素座標を返すため元の座標系へ戻す）
+        scale = self.processing_scale
+        motion_events = []
+        for label, extent in zip(candidates + 1, extents):
+            x, y, w, h, area = (int(v) for v in stats[label])
+            
+            # 輪郭は残った候補についてのみ抽出（信頼度計算と可視化に使用）
+            contour = self._component_contour(labels, label, x, y, w, h)
+            if contour is None or not self._has_hamster_shape(contour, extent):
+                continue
+            
+            cx, cy = centroids[label]
+            event = self._create_motion_event(
+                contour * scale if scale != 1 else contour, timestamp,
+                float(area * scale * scale),
+                (int(cx * scale), int(cy * scale)),
+                (x * scale, y * scale, w * scale, h * scale)
+            )
+            if event:
+                motion_events.append(event)
+        
+        return motion_events
+    
+    def _running_average_foreground(self, gray: np.ndarray) -> np.ndarray:
+        """移動平均背景との差分で前景マスクを生成（1画素あたり積和1回）"""
+        if self._bg_average is None or self._bg_average.shape != gray.shape:
+            self._bg_average = gray.astype(np.float32)
+        else:
+            cv2.accumulateWeighted(gray, self._bg_average, self.bg_learning_rate)
+        
+        self._bg_u8 = cv2.convertScaleAbs(self._bg_average, dst=self._bg_u8)
+        fg = cv2.absdiff(gray, self._bg_u8)
+        _, fg_mask = cv2.threshold(fg, self.bg_diff_threshold, 255, cv2.THRESH_BINARY)
+        return fg_mask
+    
+    def _fused_foreground(self, frame: np.ndarray) -> np.ndarray:
+        """numba融合カーネルで移動平均背景との前景マスクを生成"""
+        shape = (frame.shape[0] // 2, frame.shape[1] // 2)
+        init_bg = self._bg_average is None or self._bg_average.shape != shape
+        if init_bg:
+            self._bg_average = np.empty(shape, dtype=np.float32)
+        
+        fg_mask = np.empty(shape, dtype=np.uint8)
+        fused_detect(np.ascontiguousarray(frame), self._bg_average, fg_mask,
+                     self.bg_learning_rate, self.bg_diff_threshold, init_bg)
+        return fg_mask
+    
+    def _is_static_frame(self, frame: np.ndarray) -> bool:
+        """
+        縮小フレームと縮小背景（移動平均）との差分合計で静止フレームか判定
+        
+        閾値は最小面積のハムスター1匹分の差分量（min_area_px × bg_diff_threshold を
+        縮小率で換算）に motion_gate_min_area_fraction を掛けた値。
+        前フレームではなく背景と比較するため、ゆっくりした移動も取りこぼさない。
+        静止中も motion_gate_refresh_frames ごとに False を返し、
+        背景モデルの更新（照明変化への追従）を継続させる。
+        背景モデルの学習初期（motion_gate_warmup_frames 未満）は判定しない
+        """
+        if not self.motion_gate_enabled:
+            return False
+        
+        # 全画面のグレースケール化を避け、縮小後に変換する
+        small = cv2.resize(frame, self.motion_gate_size, interpolation=cv2.INTER_AREA)
+        if len(small.shape) == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if self._gate_bg is None:
+            self._gate_bg = small.astype(np.float32)
+            return False
+        
+        diff = cv2.absdiff(cv2.convertScaleAbs(self._gate_bg), small)
+        cv2.accumulateWeighted(small, self._gate_bg, self.bg_learning_rate)
+        if self._bg_frames_seen < self.motion_gate_warmup_frames:
+            return False
+        
+        cv2.threshold(diff, self.motion_gate_noise_level, 0, cv2.THRESH_TOZERO, dst=diff)
+        score = cv2.sumElems(diff)[0]
+        
+        frame_h, frame_w = frame.shape[:2]
+        gate_w, gate_h = self.motion_gate_size
+        threshold = (self.hamster_size_range['min_area_px'] * self.bg_diff_threshold
+                     * self.motion_gate_min_area_fraction * (gate_w * gate_h) / (frame_w * frame_h))
+        
+        if score >= threshold or self._gate_skipped_frames >= self.motion_gate_refresh_frames:
+            self._gate_skipped_frames = 0
+            return False
+        
+        self._gate_skipped_frames += 1
+        return True
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        """CUDA対応のOpenCVとGPUが利用可能か判定"""
+        try:
+            return hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except cv2.error:
+            return False
+    
+    def _init_cuda_pipeline(self):
+        """GPU用のストリーム・フィルタ・バッファを初期化（フレーム間で再利用）"""
+        try:
+            self.cuda_stream = cv2.cuda_Stream()
+            self._gpu_frame = cv2.cuda_GpuMat()
+            self._gpu_gray = cv2.cuda_GpuMat()
+            self._gpu_small = cv2.cuda_GpuMat()
+            self._gpu_fg_mask = cv2.cuda_GpuMat()
+            self._gpu_opened = cv2.cuda_GpuMat()
+            self._gpu_cleaned = cv2.cuda_GpuMat()
+            
+            self._gpu_open = cv2.cuda.createMorphologyFilter(cv2.MORPH_OPEN, cv2.CV_8UC1, self.morphology_kernel)
+            self._gpu_close = cv2.cuda.createMorphologyFilter(cv2.MORPH_CLOSE, cv2.CV_8UC1, self.morphology_kernel)
+            logger.info("CUDA背景差分パイプラインを使用します")
+        except Exception as e:
+            logger.warning(f"CUDAパイプライン初期化失敗 - CPU処理にフォールバック: {e}")
+            self.use_cuda = False
+    
+    def _create_bg_subtractor(self):
+        """背景差分器を生成（CUDA利用時はGPU版MOG2、移動平均背景時は不要）"""
+        if self.use_simple_bg:
+            return None
+        if self.bg_method == "knn":
+            return cv2.createBackgroundSubtractorKNN(
+                detectShadows=self.mog2_detect_shadows,
+                dist2Threshold=400.0,
+                history=500
+            )
+        if self.use_cuda:
+            return cv2.cuda.createBackgroundSubtractorMOG2(
+                history=500,
+                varThreshold=50,
+                detectShadows=self.mog2_detect_shadows
+            )
+        return cv2.createBackgroundSubtractorMOG2(
+            detectShadows=self.mog2_detect_shadows,
+            varThreshold=50,
+            history=500
+        )
+    
+    def _foreground_mask_cuda(self, frame: np.ndarray) -> np.ndarray:
+        """GPU上で前処理・背景差分・ノイズ除去を行い前景マスクを返す"""
+        stream = self.cuda_stream
+        self._gpu_frame.upload(frame, stream)
+        
+        # グレースケール変換
+        if len(frame.shape) == 3:
+            cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2GRAY, self._gpu_gray, stream=stream)
+            gray = self._gpu_gray
+        else:
+            gray = self._gpu_frame
+        
+        # ガウシアン平滑化 + 1/2縮小
+        cv2.cuda.pyrDown(gray, self._gpu_small, stream)
+        
+        # 背景差分
+        self.bg_subtractor.apply(self._gpu_small, -1, stream, self._gpu_fg_mask)
+        if self.mog2_detect_shadows:
+            cv2.cuda.threshold(self._gpu_fg_mask, 200, 255, cv2.THRESH_BINARY, self._gpu_fg_mask, stream)
+        
+        # ノイズ除去（オープニング→クロージング）
+        self._gpu_open.apply(self._gpu_fg_mask, self._gpu_opened, stream)
+        if self.mask_close_enabled:
+            self._gpu_close.apply(self._gpu_opened, self._gpu_cleaned, stream)
+            fg_mask = self._gpu_cleaned.download(stream)
+        else:
+            fg_mask = self._gpu_opened.download(stream)
+        stream.waitForCompletion()
+        return fg_mask
+    
     def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
         """フレーム前処理"""
         # グレースケール変換
@@ -169,69 +430,102 @@ class MotionDetector:
         else:
             gray = frame
         
-        # ガウシアンブラー
-        blurred = cv2.GaussianBlur(gray, (self.gaussian_kernel_size, self.gaussian_kernel_size), 0)
-        
-        return blurred
+        # ガウシアン平滑化(5x5)と1/2縮小を1パスで実行
+        return cv2.pyrDown(gray)
     
     def _clean_mask(self, mask: np.ndarray) -> np.ndarray:
         """マスクのノイズ除去"""
         # モルフォロジー演算でノイズ除去
         cleaned = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.morphology_kernel)
         
-        # 穴埋め
-        cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, self.morphology_kernel)
+        # 穴埋め（MOG2の影除去後は内部の穴が少ないため省略可能）
+        if self.mask_close_enabled:
+            cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, self.morphology_kernel)
         
         return cleaned
     
-    def _filter_hamster_contours(self, contours: List[np.ndarray]) -> List[np.ndarray]:
-        """ハムスター候補の輪郭をフィルタリング"""
-        hamster_contours = []
-        
-        for contour in contours:
-            # 面積フィルタ
-            area = cv2.contourArea(contour)
-            if not (self.hamster_size_range['min_area_px'] <= area <= self.hamster_size_range['max_area_px']):
-                continue
-            
-            # バウンディングボックス取得
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # アスペクト比フィルタ
-            aspect_ratio = w / h if h > 0 else 0
-            if not (self.hamster_size_range['min_aspect_ratio'] <= aspect_ratio <= self.hamster_size_range['max_aspect_ratio']):
-                continue
-            
-            # 輪郭の充実度チェック（ハムスターらしい形状か）
-            hull = cv2.convexHull(contour)
-            hull_area = cv2.contourArea(hull)
-            solidity = area / hull_area if hull_area > 0 else 0
-            
-            if solidity < 0.5:  # 充実度が低すぎる場合は除外
-                continue
-            
-            hamster_contours.append(contour)
+    def _filter_hamster_components(self, stats: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ハムスター候補の連結成分をフィルタリング
         
-        return hamster_contours
+        Args:
+            stats: connectedComponentsWithStats の統計（背景ラベルを除いたもの）
+            
+        Returns:
+            (候補のインデックス, 各候補の外接矩形充填率)
+        """
+        empty = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        if len(stats) == 0:
+            return empty
+        
+        # 面積閾値はフル解像度基準のため処理解像度に換算
+        area_scale = self.processing_scale * self.processing_scale
+        min_area = self.hamster_size_range['min_area_px'] / area_scale
+        max_area = self.hamster_size_range['max_area_px'] / area_scale
+        
+        # 面積フィルタ
+        areas = stats[:, cv2.CC_STAT_AREA].astype(np.float64)
+        candidates = np.flatnonzero((areas >= min_area) & (areas <= max_area))
+        
+        # ノイズ成分が大量にある場合は面積上位のみ検査（小さなノイズはハムスターではない）
+        if len(stats) > self.max_contours_full_scan:
+            top = np.argsort(-areas[candidates], kind='stable')[:self.top_contours_on_overflow]
+            candidates = np.sort(candidates[top])
+        
+        if len(candidates) == 0:
+            return empty
+        
+        # アスペクト比フィルタ
+        widths = stats[candidates, cv2.CC_STAT_WIDTH].astype(np.float64)
+        heights = stats[candidates, cv2.CC_STAT_HEIGHT].astype(np.float64)
+        aspect_ratios = widths / np.maximum(heights, 1.0)
+        aspect_ok = ((aspect_ratios >= self.hamster_size_range['min_aspect_ratio']) &
+                     (aspect_ratios <= self.hamster_size_range['max_aspect_ratio']))
+        
+        # 外接矩形充填率（extent）
+        extents = areas[candidates] / np.maximum(widths * heights, 1.0)
+        
+        return candidates[aspect_ok], extents[aspect_ok]
+    
+    @staticmethod
+    def _component_contour(labels: np.ndarray, label: int, x: int, y: int, w: int, h: int) -> Optional[np.ndarray]:
+        """連結成分の外輪郭を外接矩形ROI内で抽出"""
+        roi = (labels[y:y + h, x:x + w] == label).view(np.uint8)
+        contours, _ = cv2.findContours(roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x, y))
+        if not contours:
+            return None
+        return max(contours, key=len)
+    
+    def _has_hamster_shape(self, contour: np.ndarray, extent: float) -> bool:
+        """輪郭の充実度チェック（ハムスターらしい形状か）"""
+        if self._use_hull_solidity or len(contour) < self.hull_max_points:
+            hull_area = cv2.contourArea(cv2.convexHull(contour))
+            solidity = cv2.contourArea(contour) / hull_area if hull_area > 0 else 0
+            return solidity >= self.min_solidity  # 充実度が低すぎる場合は除外
+        
+        # 頂点数の多い輪郭は外接矩形充填率で代用
+        return extent >= self.min_extent
     
-    def _create_motion_event(self, contour: np.ndarray, timestamp: datetime, frame_shape: Tuple) -> Optional[MotionEvent]:
-        """動作イベントを作成"""
+    def _create_motion_event(self, contour: np.ndarray, timestamp: datetime, area: float,
+                             center: Tuple[int, int], bounding_box: Tuple[int, int, int, int]) -> Optional[MotionEvent]:
+        """
+        動作イベントを作成
+        
+        Args:
+            contour: 外輪郭（フル解像度）
+            timestamp: フレームのタイムスタンプ
+            area: 面積（フル解像度の画素数）
+            center: 重心（フル解像度）
+            bounding_box: 外接矩形 (x, y, width, height)（フル解像度）
+        """
         try:
-            # 基本的な幾何学的情報
-            area = cv2.contourArea(contour)
-            moments = cv2.moments(contour)
-            
-            if moments['m00'] == 0:
+            if area == 0:
                 return None
             
-            # 重心計算
-            cx = int(moments['m10'] / moments['m00'])
-            cy = int(moments['m01'] / moments['m00'])
-            center = (cx, cy)
+            cx, cy = center
             
-            # バウンディングボックス
-            x, y, w, h = cv2.boundingRect(contour)
-            bounding_box = (x, y, w, h)
+            # mm座標
+            current_mm = self._pixel_to_mm(center) if self.calibrator else None
             
             # 速度計算
             velocity_pixel = 0.0
@@ -241,25 +535,20 @@ class MotionDetector:
                 # ピクセル単位の距離
                 dx = cx - self.last_position[0]
                 dy = cy - self.last_position[1]
-                distance_pixel = np.sqrt(dx*dx + dy*dy)
+                distance_pixel = math.hypot(dx, dy)
                 
                 # FPS based velocity (assuming 30fps for now)
-                velocity_pixel = distance_pixel * 30.0  # pixel/sec
+                # ゲートで省略したフレームも含め、前回位置からの経過フレーム数で割る
+                elapsed_sec = max(self._frame_index - self._last_position_frame, 1) / 30.0
+                velocity_pixel = distance_pixel / elapsed_sec  # pixel/sec
                 
                 # mm単位の速度計算（座標校正が利用可能な場合）
-                if self.calibrator:
-                    try:
-                        # 現在位置と前回位置をmm単位に変換
-                        current_mm = self.calibrator.pixel_to_mm(center)
-                        prev_mm = self.calibrator.pixel_to_mm(self.last_position)
-                        
+                if current_mm is not None:
+                    prev_mm = self._pixel_to_mm(self.last_position)
+                    if prev_mm is not None:
                         # mm単位の距離と速度
-                        distance_mm = np.sqrt((current_mm[0] - prev_mm[0])**2 + (current_mm[1] - prev_mm[1])**2)
-                        velocity_mm = distance_mm * 30.0  # mm/sec
-                        
-                    except Exception as e:
-                        logger.debug(f"mm変換エラー: {e}")
-                        velocity_mm = 0.0
+                        distance_mm = math.hypot(current_mm[0] - prev_mm[0], current_mm[1] - prev_mm[1])
+                        velocity_mm = distance_mm / elapsed_sec  # mm/sec
             
             # 動作タイプの分類
             motion_type = self._classify_motion_type(area, velocity_pixel, velocity_mm)
@@ -277,13 +566,16 @@ class MotionDetector:
                 confidence=confidence,
                 motion_type=motion_type,
                 bounding_box=bounding_box,
-                contours=[contour]
+                contours=contour.reshape(-1, 2).astype(np.int16)
             )
             
             # 位置と速度履歴を更新
             self.last_position = center
+            self._last_position_frame = self._frame_index
             if velocity_mm > 0:
-                self.velocity_history.append(velocity_mm)
+                self._vel_hist[self._vel_idx] = velocity_mm
+                self._vel_idx = (self._vel_idx + 1) % self.velocity_history_size
+                self._vel_len = min(self._vel_len + 1, self.velocity_history_size)
             
             return event
             
@@ -291,47 +583,55 @@ class MotionDetector:
             logger.error(f"動作イベント作成エラー: {e}")
             return None
     
+    @property
+    def velocity_history(self) -> np.ndarray:
+        """直近の速度履歴（mm/sec、古い順）"""
+        if self._vel_len < self.velocity_history_size:
+            return self._vel_hist[:self._vel_len].copy()
+        return np.roll(self._vel_hist, -self._vel_idx)
+    
+    def _pixel_to_mm(self, point: Tuple[float, float]) -> Optional[Tuple[float, float]]:
+        """ピクセル座標をmm座標に変換（未校正の場合は None）"""
+        try:
+            return self.calibrator.pixel_to_mm(point)
+        except RuntimeError as e:
+            logger.debug(f"mm変換エラー: {e}")
+            return None
+    
     def _classify_motion_type(self, area: float, velocity_pixel: float, velocity_mm: float) -> str:
         """動作タイプを分類"""
-        # 主に速度に基づく分類
-        if velocity_mm > 0:  # mm単位の速度が利用可能
-            if velocity_mm > 100:  # 100mm/sec以上
-                return "rapid"
-            elif velocity_mm > 50:  # 50-100mm/sec
-                return "medium"
-            else:  # 50mm/sec以下
-                return "slow"
-        else:  # ピクセル単位の速度を使用
-            if velocity_pixel > 50:
-                return "rapid"
-            elif velocity_pixel > 20:
-                return "medium"
-            else:
-                return "slow"
+        # 主に速度に基づく分類（mm単位の速度が利用可能ならそちらを優先）
+        if velocity_mm > 0:
+            velocity, (medium_min, rapid_min) = velocity_mm, self._v_thresh_mm
+        else:
+            velocity, (medium_min, rapid_min) = velocity_pixel, self._v_thresh_px
+        
+        if velocity > rapid_min:
+            return self.MOTION_RAPID
+        return self.MOTION_MEDIUM if velocity > medium_min else self.MOTION_SLOW
     
     def _calculate_confidence(self, contour: np.ndarray, area: float, velocity: float) -> float:
         """動作検出の信頼度を計算"""
         confidence = 0.0
         
         # 面積による信頼度（適切な面積範囲内かどうか）
-        ideal_area = (self.hamster_size_range['min_area_px'] + self.hamster_size_range['max_area_px']) / 2
-        area_score = 1.0 - abs(area - ideal_area) / ideal_area
+        area_score = 1.0 - abs(area - self._ideal_area) * self._inv_ideal_area
         confidence += area_score * 0.4
         
         # 輪郭の滑らかさによる信頼度
         perimeter = cv2.arcLength(contour, True)
         if perimeter > 0:
-            circularity = 4 * np.pi * area / (perimeter * perimeter)
+            circularity = 4 * math.pi * area / (perimeter * perimeter)
             confidence += min(circularity * 2, 1.0) * 0.3
         
         # 速度による信頼度（適度な動きがあるか）
         if 1 <= velocity <= 200:  # 適切な速度範囲
-            velocity_score = 1.0 - abs(velocity - 50) / 50  # 50を理想的な速度とする
+            velocity_score = 1.0 - abs(velocity - 50) * 0.02  # 50を理想的な速度とする
             confidence += max(velocity_score, 0) * 0.3
         
         return max(0.0, min(1.0, confidence))
     
-    def _update_stats(self, motion_events: List[MotionEvent]):
+    def _update_stats(self, motion_events: List[MotionEvent], now: float):
         """統計情報を更新"""
         valid_events = [e for e in motion_events if e.confidence > 0.5]
         
@@ -354,21 +654,17 @@ class MotionDetector:
                 
                 self.stats.max_velocity_mm_s = max(self.stats.max_velocity_mm_s, max_velocity)
         
-        # 動作履歴に追加
-        self.motion_history.append({
-            'timestamp': datetime.now(),
-            'event_count': len(valid_events),
-            'max_velocity': max([e.velocity_mm for e in valid_events], default=0.0)
-        })
+        # 動作履歴に追加（リングバッファの最古要素を上書き）
+        idx = self._hist_idx
+        self._hist_ts[idx] = now
+        self._hist_cnt[idx] = len(valid_events)
+        self._hist_vmax[idx] = max([e.velocity_mm for e in valid_events], default=0.0)
+        self._hist_idx = (idx + 1) % self.motion_history_size
     
-    def _evaluate_activity_state(self, motion_events: List[MotionEvent], timestamp: datetime):
+    def _evaluate_activity_state(self, motion_events: List[MotionEvent], timestamp: datetime, now: float):
         """活動状態を評価"""
-        # 現在の動作量を計算
-        current_activity = len([e for e in motion_events if e.confidence > 0.5])
-        
-        # 過去の動作履歴から活動レベルを算出
-        recent_history = [h for h in self.motion_history if (timestamp - h['timestamp']).total_seconds() <= 60]
-        total_activity = sum(h['event_count'] for h in recent_history)
+        # 過去1分間の動作履歴から活動レベルを算出（現フレーム分は _update_stats で記録済み）
+        total_activity = int(self._hist_cnt.sum(where=self._hist_ts >= now - 60))
         
         # 活動状態の判定
         new_state = "rest"
@@ -377,7 +673,7 @@ class MotionDetector:
         
         # 状態変化をチェック
         if new_state != self.current_activity_state:
-            time_since_change = (timestamp - self.last_activity_change).total_seconds()
+            time_since_change = now - self._last_activity_change_mono
             
             # 最小時間経過後に状態変化を認定
             min_state_duration = 30  # 30秒
@@ -385,6 +681,7 @@ class MotionDetector:
                 logger.info(f"活動状態変化: {self.current_activity_state} -> {new_state}")
                 self.current_activity_state = new_state
                 self.last_activity_change = timestamp
+                self._last_activity_change_mono = now
                 
                 # 統計更新
                 if new_state == "active":
@@ -402,14 +699,24 @@ class MotionDetector:
     
     def get_stats(self) -> Dict:
         """統計情報を取得"""
-        return asdict(self.stats)
+        stats = self.stats
+        return {
+            'total_detections': stats.total_detections,
+            'valid_detections': stats.valid_detections,
+            'false_positives': stats.false_positives,
+            'average_velocity_mm_s': stats.average_velocity_mm_s,
+            'max_velocity_mm_s': stats.max_velocity_mm_s,
+            'active_periods': stats.active_periods,
+            'rest_periods': stats.rest_periods,
+            'session_start': stats.session_start
+        }
     
     def get_recent_motion_summary(self, minutes: int = 5) -> Dict:
         """最近の動作サマリーを取得"""
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        recent_motions = [h for h in self.motion_history if h['timestamp'] >= cutoff_time]
+        cutoff_time = time.monotonic() - minutes * 60
+        recent_mask = self._hist_ts >= cutoff_time
         
-        if not recent_motions:
+        if not recent_mask.any():
             return {
                 'period_minutes': minutes,
                 'motion_events': 0,
@@ -418,8 +725,8 @@ class MotionDetector:
                 'activity_level': 'no_data'
             }
         
-        total_events = sum(h['event_count'] for h in recent_motions)
-        velocities = [h['max_velocity'] for h in recent_motions if h['max_velocity'] > 0]
+        total_events = int(self._hist_cnt.sum(where=recent_mask))
+        velocities = self._hist_vmax[recent_mask & (self._hist_vmax > 0)]
         
         activity_level = "low"
         if total_events > 20:
@@ -430,23 +737,40 @@ class MotionDetector:
         return {
             'period_minutes': minutes,
             'motion_events': total_events,
-            'average_velocity': np.mean(velocities) if velocities else 0.0,
-            'max_velocity': max(velocities) if velocities else 0.0,
+            'average_velocity': float(velocities.mean()) if velocities.size else 0.0,
+            'max_velocity': float(velocities.max()) if velocities.size else 0.0,
             'activity_level': activity_level
         }
     
     def reset_background_model(self):
-        """背景モデルをリセット"""
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows=True,
-            varThreshold=50,
-            history=500
-        )
+        """
+        背景モデルをリセット
+        
+        MOG2 は learningRate=1.0 で apply すると内部モデルを直近フレームで再初期化するため、
+        差分器を作り直さずに履歴を破棄する（KNN は再初期化されないため作り直す）
+        """
+        if self.bg_method == "mog2" and self.use_cuda and self._bg_frames_seen > 0:
+            self.bg_subtractor.apply(self._gpu_small, 1.0, self.cuda_stream, self._gpu_fg_mask)
+            self.cuda_stream.waitForCompletion()
+        elif self.bg_method == "mog2" and not self.use_cuda and self._last_processed is not None:
+            self.bg_subtractor.apply(self._last_processed, learningRate=1.0)
+        else:
+            self.bg_subtractor = self._create_bg_subtractor()
+        self._bg_average = None
+        self._gate_bg = None
+        self._bg_frames_seen = 0
         logger.info("背景モデルをリセットしました")
     
-    def visualize_detection(self, frame: np.ndarray, motion_events: List[MotionEvent]) -> np.ndarray:
-        """動作検出結果を可視化"""
-        vis_frame = frame.copy()
+    def visualize_detection(self, frame: np.ndarray, motion_events: List[MotionEvent], in_place: bool = False) -> np.ndarray:
+        """
+        動作検出結果を可視化
+        
+        Args:
+            frame: 入力フレーム
+            motion_events: 描画する動作イベント
+            in_place: True なら入力フレームに直接描画（元フレームが不要な場合のコピー省略）
+        """
+        vis_frame = frame if in_place else frame.copy()
         
         for event in motion_events:
             # 信頼度に応じて色を変更
@@ -474,7 +798,7 @@ class MotionDetector:
                 cv2.putText(vis_frame, vel_text, (x, y + h + 15), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
             
             # 輪郭描画
-            cv2.drawContours(vis_frame, event.contours, -1, color, 1)
+            cv2.drawContours(vis_frame, [event.contours.reshape(-1, 1, 2).astype(np.int32)], -1, color, 1)
         
         # 活動状態表示
         state_color = (0, 255, 0) if self.current_activity_state == "active" else (128, 128, 128)
@@ -522,8 +846,8 @@ def main():
             # 動作検出
             motion_events = motion_detector.detect_motion(frame)
             
-            # 結果の可視化
-            vis_frame = motion_detector.visualize_detection(frame, motion_events)
+            # 結果の可視化（読み込んだフレームは以後使わないため直接描画）
+            vis_frame = motion_detector.visualize_detection(frame, motion_events, in_place=True)
             
             # 統計情報表示
             if len(motion_events) > 0:
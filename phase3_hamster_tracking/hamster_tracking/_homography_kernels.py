@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+座標校正用 numba カーネル
+4点対応からのホモグラフィ計算と逆行列計算、1点・複数点の射影変換を行う
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# プロジェクトパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from phase3_hamster_tracking.utils.numba_compat import njit, prange
+
+# ピボットがこれ以下なら4点が退化している（3点が同一直線上など）とみなす
+_SINGULAR_EPS = 1e-12
+
+# cv2.perspectiveTransform と同じ同次座標 w の下限（FLT_EPSILON）
+_W_EPS = float(np.finfo(np.float32).eps)
+
+@njit("float64[:, ::1](float64[:, ::1], float64[:, ::1])", cache=True)
+def homography4(src, dst):
+    """
+    4点対応から 3x3 ホモグラフィ行列を直接計算（DLT, h33 = 1）
+
+    各対応点から2式ずつ、計8元の連立一次方程式を組み立て、
+    部分ピボット付きガウス消去で解く（SVD・RANSAC を使わない）。
+
+    Args:
+        src: 変換元の4点 (4, 2) float64
+        dst: 変換先の4点 (4, 2) float64
+
+    Returns:
+        3x3 ホモグラフィ行列 (dst ~ H @ src)
+
+    Raises:
+        ValueError: 4点が退化していて解が求まらない場合
+    """
+    a = np.zeros((8, 9))
+    for i in range(4):
+        x = src[i, 0]
+        y = src[i, 1]
+        u = dst[i, 0]
+        v = dst[i, 1]
+        r = 2 * i
+        a[r, 0] = x
+        a[r, 1] = y
+        a[r, 2] = 1.0
+        a[r, 6] = -u * x
+        a[r, 7] = -u * y
+        a[r, 8] = u
+        a[r + 1, 3] = x
+        a[r + 1, 4] = y
+        a[r + 1, 5] = 1.0
+        a[r + 1, 6] = -v * x
+        a[r + 1, 7] = -v * y
+        a[r + 1, 8] = v
+
+    # 前進消去（部分ピボット選択）
+    for col in range(8):
+        pivot = col
+        best = abs(a[col, col])
+        for r in range(col + 1, 8):
+            if abs(a[r, col]) > best:
+                best = abs(a[r, col])
+                pivot = r
+        if best < _SINGULAR_EPS:
+            raise ValueError("4点が退化しているためホモグラフィを計算できません")
+        if pivot != col:
+            for c in range(col, 9):
+                tmp = a[col, c]
+                a[col, c] = a[pivot, c]
+                a[pivot, c] = tmp
+        for r in range(col + 1, 8):
+            f = a[r, col] / a[col, col]
+            if f != 0.0:
+                for c in range(col, 9):
+                    a[r, c] -= f * a[col, c]
+
+    # 後退代入
+    h = np.empty(9)
+    h[8] = 1.0
+    for r in range(7, -1, -1):
+        s = a[r, 8]
+        for c in range(r + 1, 8):
+            s -= a[r, c] * h[c]
+        h[r] = s / a[r, r]
+
+    return h.reshape((3, 3))
+
+@njit("float64[:, ::1](float64[:, ::1])", cache=True)
+def invert3(h):
+    """
+    3x3 行列の逆行列を余因子（随伴行列）から直接計算
+
+    Args:
+        h: 3x3 行列 float64
+
+    Returns:
+        逆行列 3x3 float64
+
+    Raises:
+        ValueError: 行列が特異で逆行列が存在しない場合
+    """
+    c00 = h[1, 1] * h[2, 2] - h[1, 2] * h[2, 1]
+    c01 = h[1, 2] * h[2, 0] - h[1, 0] * h[2, 2]
+    c02 = h[1, 0] * h[2, 1] - h[1, 1] * h[2, 0]
+    det = h[0, 0] * c00 + h[0, 1] * c01 + h[0, 2] * c02
+    if det == 0.0:
+        raise ValueError("行列が特異なため逆行列を計算できません")
+    inv_det = 1.0 / det
+
+    inv = np.empty((3, 3))
+    inv[0, 0] = c00 * inv_det
+    inv[1, 0] = c01 * inv_det
+    inv[2, 0] = c02 * inv_det
+    inv[0, 1] = (h[0, 2] * h[2, 1] - h[0, 1] * h[2, 2]) * inv_det
+    inv[1, 1] = (h[0, 0] * h[2, 2] - h[0, 2] * h[2, 0]) * inv_det
+    inv[2, 1] = (h[0, 1] * h[2, 0] - h[0, 0] * h[2, 1]) * inv_det
+    inv[0, 2] = (h[0, 1] * h[1, 2] - h[0, 2] * h[1, 1]) * inv_det
+    inv[1, 2] = (h[0, 2] * h[1, 0] - h[0, 0] * h[1, 2]) * inv_det
+    inv[2, 2] = (h[0, 0] * h[1, 1] - h[0, 1] * h[1, 0]) * inv_det
+    return inv
+
+@njit("UniTuple(float64, 2)(float64[:, ::1], float64, float64)", cache=True)
+def project_point(h, x, y):
+    """
+    1点をホモグラフィで射影変換（cv2.perspectiveTransform の1点版）
+
+    Args:
+        h: 3x3 ホモグラフィ行列 float64
+        x, y: 変換元の座標
+
+    Returns:
+        変換後の座標 (x, y)
+    """
+    w = h[2, 0] * x + h[2, 1] * y + h[2, 2]
+    if abs(w) <= _W_EPS:
+        return 0.0, 0.0
+    inv_w = 1.0 / w
+    return ((h[0, 0] * x + h[0, 1] * y + h[0, 2]) * inv_w,
+            (h[1, 0] * x + h[1, 1] * y + h[1, 2]) * inv_w)
+
+@njit("void(float64[:, ::1], float32[:, :, ::1], float32[:, :, ::1])",
+      parallel=True, fastmath=True, cache=True)
+def project_points(h, pts, out):
+    """
+    複数点をホモグラフィで射影変換（cv2.perspectiveTransform の numba 版）
+
+    Args:
+        h: 3x3 ホモグラフィ行列 float64
+        pts: 変換元の座標 (N, 1, 2) float32
+        out: 変換後の座標 (N, 1, 2) float32（出力先）
+    """
+    h00 = h[0, 0]
+    h01 = h[0, 1]
+    h02 = h[0, 2]
+    h10 = h[1, 0]
+    h11 = h[1, 1]
+    h12 = h[1, 2]
+    h20 = h[2, 0]
+    h21 = h[2, 1]
+    h22 = h[2, 2]
+    for i in prange(pts.shape[0]):
+        x = float(pts[i, 0, 0])
+        y = float(pts[i, 0, 1])
+        w = h20 * x + h21 * y + h22
+        if abs(w) <= _W_EPS:
+            out[i, 0, 0] = 0.0
+            out[i, 0, 1] = 0.0
+        else:
+            inv_w = 1.0 / w
+            out[i, 0, 0] = (h00 * x + h01 * y + h02) * inv_w
+            out[i, 0, 1] = (h10 * x + h11 * y + h12) * inv_w
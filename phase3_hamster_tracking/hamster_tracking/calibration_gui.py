@@ -15,7 +15,11 @@ import cv2
 import numpy as np
 import argparse
 import time
+import threading
 from typing import List, Tuple, Optional, Dict, Any
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
@@ -24,60 +28,240 @@ from PIL import Image, ImageDraw, ImageFont
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from phase3_hamster_tracking.utils.hamster_config import HamsterTrackingConfig, load_config
 from phase3_hamster_tracking.hamster_tracking.coordinate_calibrator import CoordinateCalibrator
+from phase3_hamster_tracking.hamster_tracking._homography_kernels import project_point
 from rtsp_stream import RTSPStream
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 描画済みテキストタイルのキャッシュ: (text, font_size, color) -> (premultiplied BGR, 255 - alpha, bbox左上オフセット)
+_TEXT_CACHE: Dict[Tuple[str, int, Tuple[int, int, int]], Tuple[np.ndarray, np.ndarray, Tuple[int, int]]] = {}
+_TEXT_CACHE_MAX = 256
+
+# 日本語フォントの候補（先に見つかったものを使用）
+_FONT_PATHS = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+)
+
+# 読み込み済みフォントのキャッシュ: font_size -> フォント
+_FONT_CACHE: Dict[int, Any] = {}
+
+# 日本語フォントが使えるか（読み込みに1度失敗したら False にし、以降は PIL を経由しない）
+_font_ok = True
+
+def _get_font(size: int):
+    """
+    フォントサイズごとに1度だけ .ttc を読み込み、以降は解析済みのフォントを再利用
+    
+    Returns:
+        フォント（日本語フォントが見つからない場合は None）
+    """
+    global _font_ok
+    
+    font = _FONT_CACHE.get(size)
+    if font is not None or not _font_ok:
+        return font
+    
+    for path in _FONT_PATHS:
+        try:
+            font = ImageFont.truetype(path, size)
+            break
+        except OSError:
+            continue
+    else:
+        logger.warning("日本語フォントが見つかりません - cv2.putText で描画します")
+        _font_ok = False
+        return None
+    
+    _FONT_CACHE[size] = font
+    return font
+
+def _render_text_tile(text: str, font_size: int, color_rgb: Tuple[int, int, int]):
+    """
+    文字列を必要最小サイズのタイルに描画（画像全体のPIL変換を避ける）
+    
+    Args:
+        color_rgb: 文字色（PIL と同じ RGB 順）
+    
+    Returns:
+        (premultiplied BGR, 255 - alpha, bbox左上オフセット)（フォントが無い場合は None）
+    """
+    font = _get_font(font_size)
+    if font is None:
+        return None
+    
+    left, top, right, bottom = font.getbbox(text)
+    tile = Image.new('RGBA', (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(tile).text((-left, -top), text, font=font, fill=color_rgb + (255,))
+    
+    rgba = np.asarray(tile)
+    alpha = rgba[:, :, 3:4].astype(np.uint16)
+    premultiplied = cv2.cvtColor(rgba[:, :, :3], cv2.COLOR_RGB2BGR).astype(np.uint16) * alpha
+    return premultiplied, 255 - alpha, (left, top)
+
+def _blit_text_tile(image: np.ndarray, cached, position: Tuple[int, int]) -> None:
+    """キャッシュ済みタイルを画像にアルファ合成（画像外の部分は切り捨て）"""
+    premultiplied, inv_alpha, (left, top) = cached
+    th, tw = inv_alpha.shape[:2]
+    h, w = image.shape[:2]
+    x0, y0 = position[0] + left, position[1] + top
+    
+    # 画像範囲にクリップ
+    sx0, sy0 = max(0, -x0), max(0, -y0)
+    sx1, sy1 = min(tw, w - x0), min(th, h - y0)
+    if sx0 >= sx1 or sy0 >= sy1:
+        return
+    
+    roi = image[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1]
+    blended = roi * inv_alpha[sy0:sy1, sx0:sx1] + premultiplied[sy0:sy1, sx0:sx1]
+    roi[:] = (blended + 127) // 255
+
+def _put_ascii_text(image, text, position, font_size, color):
+    """日本語フォントが使えない場合の cv2.putText による代替描画"""
+    fallback_text = text.encode('ascii', 'replace').decode('ascii')
+    cv2.putText(image, fallback_text, position, cv2.FONT_HERSHEY_SIMPLEX, 
+               font_size/30, color, 1)
+    return image
+
 # 日本語表示用関数（既存のものを再利用）
 def put_japanese_text(image, text, position, font_size=20, color=(255, 255, 255)):
-    """OpenCV画像に日本語テキストを描画"""
+    """OpenCV画像に日本語テキストを描画（文字列単位のタイルキャッシュを使い、画像に直接合成）"""
+    if not _font_ok:
+        return _put_ascii_text(image, text, position, font_size, color)
+    
     try:
-        pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_image)
-        
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc", font_size)
-            except:
-                font = ImageFont.load_default()
-        
-        pil_color = (color[2], color[1], color[0])
-        draw.text(position, text, font=font, fill=pil_color)
+        if type(color) is not tuple:
+            color = tuple(color)
+        key = (text, font_size, color)
+        cached = _TEXT_CACHE.get(key)
+        if cached is None:
+            cached = _render_text_tile(text, font_size, color[::-1])
+            if cached is None:
+                return _put_ascii_text(image, text, position, font_size, color)
+            
+            if len(_TEXT_CACHE) >= _TEXT_CACHE_MAX:
+                _TEXT_CACHE.clear()
+            _TEXT_CACHE[key] = cached
         
-        return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        _blit_text_tile(image, cached, position)
+        return image
     
     except Exception as e:
-        fallback_text = text.encode('ascii', 'replace').decode('ascii')
-        cv2.putText(image, fallback_text, position, cv2.FONT_HERSHEY_SIMPLEX, 
-                   font_size/30, color, 1)
-        return image
+        return _put_ascii_text(image, text, position, font_size, color)
+
+@contextmanager
+def _pil_session(image: np.ndarray):
+    """
+    複数の日本語テキストを1回の PIL 変換でまとめて描画するコンテキスト
+    
+    入る時に1度だけ RGB の PIL 画像に変換し、出る時に image へ書き戻す。
+    使い捨ての文字列（校正結果の数値など）をタイルキャッシュに溜めずに描画する用途向け。
+    
+    Yields:
+        draw_text(text, position, font_size=20, color=(255, 255, 255)) 関数（color は BGR）
+    """
+    # フォントが無い場合は PIL を使わず cv2.putText で直接描画
+    if not _font_ok:
+        yield lambda text, position, font_size=20, color=(255, 255, 255): \
+            _put_ascii_text(image, text, position, font_size, color)
+        return
+    
+    pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    draw = ImageDraw.Draw(pil_image)
+    fallback = []
+    
+    def draw_text(text, position, font_size=20, color=(255, 255, 255)):
+        font = _get_font(font_size)
+        if font is None:
+            fallback.append((text, position, font_size, color))  # 書き戻し後に描画
+            return
+        draw.text(position, text, font=font, fill=(color[2], color[1], color[0]))
+    
+    try:
+        yield draw_text
+    finally:
+        cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2BGR, dst=image)
+        for text, position, font_size, color in fallback:
+            _put_ascii_text(image, text, position, font_size, color)
 
 class CalibrationGUI:
     """GUI座標校正システム"""
     
-    def __init__(self, config: HamsterTrackingConfig = None, stream_type: str = "sub"):
+    # 校正点の選択順ラベル
+    POINT_LABELS = ["左上", "右上", "右下", "左下"]
+    
+    # 画面下部の情報パネルの高さ（ピクセル）
+    INFO_PANEL_HEIGHT = 120
+    
+    def __init__(self, config: HamsterTrackingConfig = None, stream_type: str = "sub",
+                 display_max_width: int = 960):
         """
         初期化
         
         Args:
             config: ハムスター管理システム設定
             stream_type: RTSPストリーム種別
+            display_max_width: 表示幅の上限（これより大きいフレームは縮小して表示）
         """
         self.config = config if config else load_config()
         self.stream_type = stream_type
+        self.display_max_width = display_max_width
         self.calibrator = CoordinateCalibrator(self.config)
         
         # GUI状態管理
         self.calibration_points: List[Tuple[int, int]] = []
         self.current_frame: Optional[np.ndarray] = None
         self.display_frame: Optional[np.ndarray] = None
-        self.mouse_pos: Tuple[int, int] = (0, 0)
+        self.mouse_pos: Tuple[int, int] = (0, 0)   # 元フレームのピクセル座標
         self.is_calibrated: bool = False
         self.calibration_result = None
+        self.test_mode: bool = False
+        
+        # テストモードの座標変換用ホモグラフィ（校正完了時に保持）
+        self._homography: Optional[np.ndarray] = None
+        
+        # 画素ごとのmm座標とケージ内判定のルックアップテーブル（校正後、フレームサイズ確定時に生成）
+        self._mm_lut: Optional[np.ndarray] = None
+        self._in_cage: Optional[np.ndarray] = None
+        
+        # テストモードの座標表示帯のLRUキャッシュ（マウス位置を test_coord_step 画素単位に丸めてキー化）
+        self.test_coord_step = 4
+        self._coord_strips: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        self._coord_strips_max = 64
+        
+        # オーバーレイキャッシュ（校正点・境界線・ラベルなどフレームに依存しない部分）
+        self._overlay_cache: Optional[Tuple[np.ndarray, np.ndarray, float]] = None
+        self._overlay_key = None
+        
+        # オーバーレイ再生成用の作業バッファ（レイヤー, 白背景, 残存率, 内部マスク）
+        self._overlay_bufs: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        
+        # 表示用バッファ（フレームサイズが変わるまで使い回す）
+        self._scratch: Optional[np.ndarray] = None
+        
+        # フレーム取得スレッド（最新フレーム1枚だけを保持し、描画は GUI スレッドのペースで行う）
+        self._latest_frame: Optional[np.ndarray] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop = threading.Event()
+        self.display_interval_ms = 30
+        
+        # 表示倍率（校正点・マウス位置は元フレームの座標で保持し、描画時のみ表示座標に変換）
+        self._display_scale: float = 1.0
+        self._mouse_disp: Tuple[int, int] = (0, 0)
+        
+        # 情報パネルを別スレッドで描画するためのワーカー（マルチコア時のみ、初回描画時に生成）
+        self.parallel_draw = (os.cpu_count() or 1) > 1
+        self._draw_pool: Optional[ThreadPoolExecutor] = None
+        
+        # 最後に表示したフレームと、その描画時の状態（変化が無ければ再描画を省略）
+        self._last_shown: Optional[np.ndarray] = None
+        self._last_paint_key = None
+        
+        # 情報パネルのキャッシュ（表示内容が変わった時だけ描き直す）
+        self._info_panel: Optional[np.ndarray] = None
+        self._info_key = None
         
         # GUI設定
         self.window_name = "ハムスターケージ校正ツール"
@@ -89,20 +273,37 @@ class CalibrationGUI:
             'bg': (0, 0, 0),           # 黒（背景）
             'grid': (128, 128, 128)    # グレー（グリッド）
         }
+        self.colors_rgb = {name: bgr[::-1] for name, bgr in self.colors.items()}  # PIL 描画用
         
         # ケージ情報
         self.cage_size = (self.config.cage.width, self.config.cage.height)
         
+        # 校正点ラベルと選択ガイドは4種類ずつしかないので、起動時にタイルとして描画しておく
+        self._label_tiles = self._prerender_tiles(
+            [f"{i+1}: {label}" for i, label in enumerate(self.POINT_LABELS)], 16, self.colors_rgb['text'])
+        self._guide_tiles = self._prerender_tiles(
+            [f"次の点: {label} をクリック" for label in self.POINT_LABELS], 18, self.colors_rgb['current'])
+        
         logger.info(f"GUI校正ツール初期化完了 - ケージサイズ: {self.cage_size[0]}x{self.cage_size[1]}mm")
     
+    def _to_display(self, point: Tuple[int, int]) -> Tuple[int, int]:
+        """元フレームの座標を表示座標に変換"""
+        if self._display_scale == 1.0:
+            return point
+        return (int(round(point[0] * self._display_scale)), int(round(point[1] * self._display_scale)))
+    
     def mouse_callback(self, event, x, y, flags, param):
-        """マウスコールバック関数"""
+        """マウスコールバック関数（表示座標を元フレームの座標に戻して保持）"""
+        self._mouse_disp = (x, y)
+        if self._display_scale != 1.0:
+            x, y = int(x / self._display_scale), int(y / self._display_scale)
         self.mouse_pos = (x, y)
         
         if event == cv2.EVENT_LBUTTONDOWN:
             if len(self.calibration_points) < 4:
                 # 新しい校正点を追加
                 self.calibration_points.append((x, y))
+                self._overlay_key = None
                 logger.info(f"校正点{len(self.calibration_points)}を追加: ({x}, {y})")
                 
                 if len(self.calibration_points) == 4:
@@ -116,12 +317,17 @@ class CalibrationGUI:
                 logger.info(f"校正点を削除: {removed}")
                 self.is_calibrated = False
                 self.calibration_result = None
+                self._overlay_key = None
     
     def _perform_calibration(self):
         """校正実行"""
         try:
             self.calibration_result = self.calibrator.calibrate_manual_4point(self.calibration_points)
             self.is_calibrated = True
+            self._homography = np.ascontiguousarray(self.calibration_result.homography_matrix, dtype=np.float64)
+            self._mm_lut = None
+            self._in_cage = None
+            self._coord_strips.clear()
             
             # 校正データ保存
             self.calibrator.save_calibration()
@@ -136,128 +342,338 @@ class CalibrationGUI:
             logger.error(f"校正エラー: {e}")
             self.is_calibrated = False
     
-    def _draw_calibration_overlay(self, frame: np.ndarray) -> np.ndarray:
-        """校正用オーバーレイ描画"""
-        overlay = frame.copy()
-        
+    @staticmethod
+    def _prerender_tiles(texts: List[str], font_size: int, color_rgb: Tuple[int, int, int]) -> List[Any]:
+        """固定文字列をテキストタイルとして事前描画（フォントが無い場合は None）"""
+        tiles = []
+        for text in texts:
+            try:
+                tiles.append(_render_text_tile(text, font_size, color_rgb))
+            except Exception as e:
+                logger.debug(f"テキストタイル事前描画失敗: {e}")
+                tiles.append(None)
+        return tiles
+    
+    @staticmethod
+    def _draw_tile(image: np.ndarray, tile, text: str, position: Tuple[int, int], 
+                   font_size: int, color: Tuple[int, int, int]) -> np.ndarray:
+        """事前描画タイルを貼り付け（タイルが無い場合は通常のテキスト描画）"""
+        if tile is None:
+            return put_japanese_text(image, text, position, font_size=font_size, color=color)
+        _blit_text_tile(image, tile, position)
+        return image
+    
+    def _draw_static_overlay(self, canvas: np.ndarray) -> np.ndarray:
+        """フレームに依存しないオーバーレイ（校正点・ラベル・境界線）を描画"""
         # 既存の校正点を描画
-        point_labels = ["左上", "右上", "右下", "左下"]
-        for i, (x, y) in enumerate(self.calibration_points):
+        for i, point in enumerate(self.calibration_points):
+            x, y = self._to_display(point)
+            
             # 校正点の円
-            cv2.circle(overlay, (x, y), 8, self.colors['point'], -1)
-            cv2.circle(overlay, (x, y), 10, self.colors['text'], 2)
+            cv2.circle(canvas, (x, y), 8, self.colors['point'], -1)
+            cv2.circle(canvas, (x, y), 10, self.colors['text'], 2)
             
             # 点番号とラベル
-            label = f"{i+1}: {point_labels[i]}"
-            overlay = put_japanese_text(overlay, label, (x + 15, y - 10), 
-                                      font_size=16, color=self.colors['text'])
+            label = f"{i+1}: {self.POINT_LABELS[i]}"
+            canvas = self._draw_tile(canvas, self._label_tiles[i], label, (x + 15, y - 10), 
+                                     16, self.colors['text'])
         
         # ケージ境界線を描画（4点選択後）
         if len(self.calibration_points) == 4:
-            points = np.array(self.calibration_points, np.int32)
+            points = np.array([self._to_display(p) for p in self.calibration_points], np.int32)
             points = points.reshape((-1, 1, 2))
-            cv2.polylines(overlay, [points], True, self.colors['line'], 2)
-            
-            # ケージ領域を半透明で塗りつぶし
-            mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-            cv2.fillPoly(mask, [points], 255)
-            colored_mask = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-            colored_mask[:, :, 0] = 0  # 青要素を削除
-            overlay = cv2.addWeighted(overlay, 0.9, colored_mask, 0.1, 0)
+            cv2.polylines(canvas, [points], True, self.colors['line'], 2)
+        
+        return canvas
+    
+    def _build_overlay_cache(self, shape: Tuple[int, ...]):
+        """
+        静的オーバーレイを合成用レイヤーとして生成
+        
+        黒背景と白背景に同じ内容を描画し、その差から透過率を求める
+        （アンチエイリアスされたテキストの縁も再現できる）。
+        
+        4点選択後のケージ領域の半透明塗りつぶし（frame * 0.9 + tint * 0.1）も
+        ここで加算項と倍率に織り込み、毎フレームの合成を multiply + add の2回で済ませる。
+        
+        Returns:
+            (加算レイヤー, 背景の残存率 0-255, 背景に掛ける倍率)
+        """
+        # 作業バッファはフレームサイズが変わった時だけ確保し直す
+        # （キャッシュは常に丸ごと差し替えるので、前回のレイヤーを上書きしてよい）
+        if self._overlay_bufs is None or self._overlay_bufs[0].shape != tuple(shape):
+            self._overlay_bufs = (np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8),
+                                  np.empty(shape, dtype=np.uint8), np.empty(shape[:2], dtype=np.uint8))
+        layer, on_white, inv_alpha, interior = self._overlay_bufs
+        
+        layer.fill(0)
+        on_white.fill(255)
+        self._draw_static_overlay(layer)
+        self._draw_static_overlay(on_white)
+        cv2.subtract(on_white, layer, dst=inv_alpha)
+        scale = 1.0 / 255
+        
+        if len(self.calibration_points) == 4:
+            # ケージ領域を半透明で塗りつぶす（layer * 0.9 + (0, 255, 255) * 0.1 を内部のみに加算）
+            points = np.array([self._to_display(p) for p in self.calibration_points], np.int32).reshape((-1, 1, 2))
+            interior.fill(0)
+            if cv2.isContourConvex(points):
+                cv2.fillConvexPoly(interior, points, 255)
+            else:
+                # クリック順が崩れて自己交差している場合は一般の多角形として塗る
+                cv2.fillPoly(interior, [points], 255)
+            cv2.convertScaleAbs(layer, dst=layer, alpha=0.9)
+            cv2.add(layer, (0, 26, 26, 0), dst=layer, mask=interior)
+            scale *= 0.9
+        
+        return layer, inv_alpha, scale
+    
+    def _draw_calibration_overlay(self, frame: np.ndarray) -> np.ndarray:
+        """校正用オーバーレイ描画（frame に直接描画。静的部分はキャッシュを合成し、マウス位置のみ毎フレーム描画）"""
+        key = (tuple(self.calibration_points), self.is_calibrated, self.test_mode, frame.shape, 
+               self._display_scale)
+        if self._overlay_key != key or self._overlay_cache is None:
+            self._overlay_cache = self._build_overlay_cache(frame.shape)
+            self._overlay_key = key
+        layer, inv_alpha, scale = self._overlay_cache
+        
+        # 静的レイヤーとケージ領域の塗りつぶしを合成: frame * (1 - alpha) * scale + layer
+        overlay = frame
+        cv2.multiply(overlay, inv_alpha, dst=overlay, scale=scale)
+        cv2.add(overlay, layer, dst=overlay)
         
         # 現在のマウス位置
         if len(self.calibration_points) < 4:
-            cv2.circle(overlay, self.mouse_pos, 5, self.colors['current'], -1)
+            cv2.circle(overlay, self._mouse_disp, 5, self.colors['current'], -1)
             
             # 次に選択すべき点のガイド
             next_point = len(self.calibration_points)
-            guide_text = f"次の点: {point_labels[next_point]} をクリック"
-            overlay = put_japanese_text(overlay, guide_text, (10, 30), 
-                                      font_size=18, color=self.colors['current'])
+            guide_text = f"次の点: {self.POINT_LABELS[next_point]} をクリック"
+            overlay = self._draw_tile(overlay, self._guide_tiles[next_point], guide_text, (10, 30), 
+                                      18, self.colors['current'])
         
         return overlay
     
-    def _draw_calibration_info(self, frame: np.ndarray) -> np.ndarray:
-        """校正情報表示"""
-        info_frame = frame.copy()
-        h, w = frame.shape[:2]
-        
-        # 情報パネル背景
-        info_height = 120
-        cv2.rectangle(info_frame, (0, h - info_height), (w, h), self.colors['bg'], -1)
-        
-        y_offset = h - info_height + 20
-        
-        # 基本情報
-        cage_info = f"ケージサイズ: {self.cage_size[0]}×{self.cage_size[1]}mm"
-        info_frame = put_japanese_text(info_frame, cage_info, (10, y_offset), 
-                                     font_size=16, color=self.colors['text'])
+    def _render_info_panel(self, width: int) -> np.ndarray:
+        """情報パネル（黒背景・校正情報・操作ガイド）を1枚の帯画像として描画"""
+        panel = np.zeros((self.INFO_PANEL_HEIGHT, width, 3), dtype=np.uint8)
+        panel[:] = self.colors['bg']
         
-        points_info = f"校正点: {len(self.calibration_points)}/4"
-        info_frame = put_japanese_text(info_frame, points_info, (250, y_offset), 
-                                     font_size=16, color=self.colors['text'])
+        y_offset = 20
         
-        # 校正結果情報
-        if self.is_calibrated and self.calibration_result:
-            y_offset += 25
-            accuracy_info = f"RMSE誤差: {self.calibration_result.rmse_error:.2f}mm"
-            info_frame = put_japanese_text(info_frame, accuracy_info, (10, y_offset), 
-                                         font_size=16, color=self.colors['point'])
+        # 日本語テキストは1回の PIL 変換でまとめて描画
+        with _pil_session(panel) as draw_text:
+            # 基本情報
+            cage_info = f"ケージサイズ: {self.cage_size[0]}×{self.cage_size[1]}mm"
+            draw_text(cage_info, (10, y_offset), font_size=16, color=self.colors['text'])
             
-            max_error_info = f"最大誤差: {self.calibration_result.max_error:.2f}mm"
-            info_frame = put_japanese_text(info_frame, max_error_info, (250, y_offset), 
-                                         font_size=16, color=self.colors['point'])
+            points_info = f"校正点: {len(self.calibration_points)}/4"
+            draw_text(points_info, (250, y_offset), font_size=16, color=self.colors['text'])
+            
+            # 校正結果情報
+            if self.is_calibrated and self.calibration_result:
+                y_offset += 25
+                accuracy_info = f"RMSE誤差: {self.calibration_result.rmse_error:.2f}mm"
+                draw_text(accuracy_info, (10, y_offset), font_size=16, color=self.colors['point'])
+                
+                max_error_info = f"最大誤差: {self.calibration_result.max_error:.2f}mm"
+                draw_text(max_error_info, (250, y_offset), font_size=16, color=self.colors['point'])
         
         # 操作ガイド
         y_offset += 25
         guide_text = "左クリック: 点選択 | 右クリック: 点削除 | 'r': リセット | 't': テスト | 'q': 終了"
-        cv2.putText(info_frame, guide_text, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 
+        cv2.putText(panel, guide_text, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 
                    0.5, self.colors['text'], 1)
         
-        return info_frame
+        return panel
+    
+    def _draw_calibration_info(self, frame: np.ndarray) -> np.ndarray:
+        """校正情報表示（frame に直接描画。内容が変わった時だけパネルを描き直す）"""
+        h, w = frame.shape[:2]
+        
+        result = self.calibration_result if self.is_calibrated else None
+        key = (w, len(self.calibration_points),
+               (result.rmse_error, result.max_error) if result else None)
+        if self._info_key != key or self._info_panel is None:
+            self._info_panel = self._render_info_panel(w)
+            self._info_key = key
+        
+        # 画面下部にパネルを貼り付け（フレームがパネルより低い場合は下端側のみ）
+        rows = min(h, self.INFO_PANEL_HEIGHT)
+        frame[h - rows:] = self._info_panel[self.INFO_PANEL_HEIGHT - rows:]
+        
+        return frame
+    
+    def _build_mm_lut(self, shape: Tuple[int, ...]) -> None:
+        """表示画面の全画素のmm座標とケージ内判定をホモグラフィから一括計算"""
+        h, w = shape[:2]
+        inv_scale = 1.0 / self._display_scale
+        grid = np.empty((h, w, 2), dtype=np.float32)
+        grid[:, :, 0] = np.arange(w, dtype=np.float32) * inv_scale
+        grid[:, :, 1] = (np.arange(h, dtype=np.float32) * inv_scale)[:, None]
+        
+        self._mm_lut = cv2.perspectiveTransform(grid.reshape(-1, 1, 2), self._homography).reshape(h, w, 2)
+        mm_x = self._mm_lut[:, :, 0]
+        mm_y = self._mm_lut[:, :, 1]
+        self._in_cage = ((0 <= mm_x) & (mm_x <= self.cage_size[0]) & 
+                         (0 <= mm_y) & (mm_y <= self.cage_size[1])).astype(np.uint8)
+    
+    def _render_coord_strip(self, coord_text: str) -> np.ndarray:
+        """座標テキストを黒背景の帯画像として描画"""
+        (text_w, text_h), _ = cv2.getTextSize(coord_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        strip = np.zeros((26, text_w // 2 * 2 + 11, 3), dtype=np.uint8)
+        strip[:] = self.colors['bg']
+        cv2.putText(strip, coord_text, (5, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors['text'], 2)
+        return strip
+    
+    def _get_coord_strip(self, qx: int, qy: int) -> np.ndarray:
+        """丸めた表示座標 (qx, qy) の座標表示帯をLRUキャッシュから取得（無ければ描画）"""
+        key = (qx, qy)
+        strip = self._coord_strips.get(key)
+        if strip is not None:
+            self._coord_strips.move_to_end(key)
+            return strip
+        
+        mm_coord = self._mm_lut[qy, qx]
+        px, py = int(qx / self._display_scale), int(qy / self._display_scale)
+        strip = self._render_coord_strip(f"Pixel: {px}, {py} | MM: {mm_coord[0]:.1f}, {mm_coord[1]:.1f}")
+        
+        self._coord_strips[key] = strip
+        if len(self._coord_strips) > self._coord_strips_max:
+            self._coord_strips.popitem(last=False)
+        return strip
+    
+    @staticmethod
+    def _paste_strip(image: np.ndarray, strip: np.ndarray, x0: int, y0: int) -> None:
+        """帯画像を (x0, y0) を左上として貼り付け（画像外の部分は切り捨て）"""
+        sh, sw = strip.shape[:2]
+        h, w = image.shape[:2]
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        sx1, sy1 = min(sw, w - x0), min(sh, h - y0)
+        if sx0 < sx1 and sy0 < sy1:
+            image[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1] = strip[sy0:sy1, sx0:sx1]
     
     def _draw_test_overlay(self, frame: np.ndarray) -> np.ndarray:
-        """テストモード用オーバーレイ"""
+        """テストモード用オーバーレイ（frame に直接描画）"""
         if not self.is_calibrated:
             return frame
         
-        test_frame = frame.copy()
+        test_frame = frame
+        
+        if self._mm_lut is None or self._mm_lut.shape[:2] != frame.shape[:2]:
+            self._build_mm_lut(frame.shape)
+        
+        # 描画は表示座標、表示する数値は元フレームの座標
+        mx, my = self._mouse_disp
         
         # マウス位置での座標変換テスト
         try:
-            mm_coord = self.calibrator.pixel_to_mm(self.mouse_pos)
-            coord_text = f"Pixel: {self.mouse_pos[0]}, {self.mouse_pos[1]} | MM: {mm_coord[0]:.1f}, {mm_coord[1]:.1f}"
-            
-            # 座標テキスト背景
-            (text_w, text_h), _ = cv2.getTextSize(coord_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-            cv2.rectangle(test_frame, (self.mouse_pos[0] - text_w//2 - 5, self.mouse_pos[1] - 35), 
-                         (self.mouse_pos[0] + text_w//2 + 5, self.mouse_pos[1] - 10), 
-                         self.colors['bg'], -1)
+            if 0 <= mx < frame.shape[1] and 0 <= my < frame.shape[0]:
+                # 座標表示は丸めた位置の値を使い、帯画像をキャッシュから再利用
+                step = self.test_coord_step
+                strip = self._get_coord_strip(mx // step * step, my // step * step)
+                in_cage = self._in_cage[my, mx]
+            else:
+                # ウィンドウ外へのドラッグ時などはテーブル範囲外なので直接計算
+                mm_coord = project_point(self._homography, float(self.mouse_pos[0]), float(self.mouse_pos[1]))
+                in_cage = (0 <= mm_coord[0] <= self.cage_size[0] and 0 <= mm_coord[1] <= self.cage_size[1])
+                strip = self._render_coord_strip(
+                    f"Pixel: {self.mouse_pos[0]}, {self.mouse_pos[1]} | MM: {mm_coord[0]:.1f}, {mm_coord[1]:.1f}")
             
-            # 座標テキスト
-            cv2.putText(test_frame, coord_text, 
-                       (self.mouse_pos[0] - text_w//2, self.mouse_pos[1] - 15),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.colors['text'], 2)
+            # 座標テキスト（黒背景付き）をマウス位置の上に貼り付け
+            self._paste_strip(test_frame, strip, mx - strip.shape[1] // 2, my - 35)
             
             # マウス位置マーカー
-            cv2.circle(test_frame, self.mouse_pos, 3, self.colors['current'], -1)
-            cv2.circle(test_frame, self.mouse_pos, 6, self.colors['text'], 1)
+            cv2.circle(test_frame, (mx, my), 3, self.colors['current'], -1)
+            cv2.circle(test_frame, (mx, my), 6, self.colors['text'], 1)
             
             # ケージ内の場合は緑、外の場合は赤
-            if 0 <= mm_coord[0] <= self.cage_size[0] and 0 <= mm_coord[1] <= self.cage_size[1]:
-                cv2.circle(test_frame, self.mouse_pos, 10, self.colors['point'], 2)
+            if in_cage:
+                cv2.circle(test_frame, (mx, my), 10, self.colors['point'], 2)
             else:
-                cv2.circle(test_frame, self.mouse_pos, 10, (0, 0, 255), 2)
+                cv2.circle(test_frame, (mx, my), 10, (0, 0, 255), 2)
             
         except Exception as e:
             # 校正領域外の場合
             error_text = "校正領域外"
             test_frame = put_japanese_text(test_frame, error_text, 
-                                         (self.mouse_pos[0] + 10, self.mouse_pos[1] - 10),
+                                         (mx + 10, my - 10),
                                          font_size=14, color=(0, 0, 255))
         
         return test_frame
     
+    def _capture_loop(self, stream: RTSPStream):
+        """フレーム取得スレッド: ストリームの最新フレームを _latest_frame に差し替え続ける"""
+        while not self._capture_stop.is_set():
+            try:
+                result = stream.drain_latest(timeout=1.0)
+                if result and result[0]:
+                    self._latest_frame = result[1]
+                elif result is None:
+                    time.sleep(0.1)  # ストリーム停止中
+            except Exception as e:
+                logger.error(f"フレーム取得エラー: {e}")
+                time.sleep(0.1)
+    
+    def _start_capture(self, stream: RTSPStream) -> None:
+        """フレーム取得スレッドを開始"""
+        self._latest_frame = None
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, args=(stream,), daemon=True)
+        self._capture_thread.start()
+    
+    def _stop_capture(self) -> None:
+        """フレーム取得スレッドを停止"""
+        self._capture_stop.set()
+        if self._capture_thread:
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
+    
+    def _shutdown_draw_pool(self) -> None:
+        """情報パネル描画用ワーカーを停止"""
+        if self._draw_pool is not None:
+            self._draw_pool.shutdown(wait=True)
+            self._draw_pool = None
+    
+    def _render_display(self, frame: np.ndarray) -> np.ndarray:
+        """フレームを表示用バッファに取り込み、オーバーレイと情報パネルを描画"""
+        # 表示用バッファへ1回だけコピー（大きいフレームは縮小）し、以降のオーバーレイはその上に直接描画
+        h, w = frame.shape[:2]
+        self._display_scale = min(1.0, self.display_max_width / w)
+        display_size = (int(round(w * self._display_scale)), int(round(h * self._display_scale)))
+        if self._scratch is None or self._scratch.shape[1::-1] != display_size:
+            self._scratch = np.empty((display_size[1], display_size[0]) + frame.shape[2:], dtype=frame.dtype)
+        if self._display_scale < 1.0:
+            cv2.resize(frame, display_size, dst=self._scratch, interpolation=cv2.INTER_AREA)
+        else:
+            np.copyto(self._scratch, frame)
+        
+        # 情報パネル（下端）とオーバーレイ（それより上）は重ならない領域なので別々に描画する。
+        # パネルは不透明なので、オーバーレイはパネルに隠れる行を処理しない。
+        panel_rows = min(display_size[1], self.INFO_PANEL_HEIGHT)
+        top_view = self._scratch[:display_size[1] - panel_rows]
+        
+        # 情報パネル描画（マルチコア時はワーカースレッドで並行実行。OpenCV/NumPy は GIL を解放する）
+        panel_future = None
+        if self.parallel_draw:
+            if self._draw_pool is None:
+                self._draw_pool = ThreadPoolExecutor(max_workers=1)
+            panel_future = self._draw_pool.submit(self._draw_calibration_info, self._scratch)
+        else:
+            self._draw_calibration_info(self._scratch)
+        
+        # オーバーレイ描画
+        if top_view.shape[0] > 0:
+            if self.test_mode and self.is_calibrated:
+                self._draw_test_overlay(top_view)
+            else:
+                self._draw_calibration_overlay(top_view)
+        
+        if panel_future is not None:
+            panel_future.result()
+        
+        return self._scratch
+    
     def run_calibration(self, duration: int = 0):
         """
         校正GUI実行
@@ -293,7 +709,9 @@ class CalibrationGUI:
                 cv2.setMouseCallback(self.window_name, self.mouse_callback)
                 
                 start_time = time.time()
-                test_mode = False
+                self.test_mode = False
+                self._last_paint_key = None
+                self._start_capture(stream)
                 
                 while True:
                     # 時間制限チェック
@@ -301,28 +719,8 @@ class CalibrationGUI:
                         logger.info(f"時間制限 ({duration}秒) に到達")
                         break
                     
-                    # フレーム取得
-                    result = stream.get_frame(timeout=1.0)
-                    if not result or not result[0]:
-                        continue
-                    
-                    success, frame = result
-                    self.current_frame = frame.copy()
-                    
-                    # オーバーレイ描画
-                    if test_mode and self.is_calibrated:
-                        display_frame = self._draw_test_overlay(frame)
-                    else:
-                        display_frame = self._draw_calibration_overlay(frame)
-                    
-                    # 情報パネル描画
-                    display_frame = self._draw_calibration_info(display_frame)
-                    
-                    # フレーム表示
-                    cv2.imshow(self.window_name, display_frame)
-                    
-                    # キー入力処理
-                    key = cv2.waitKey(1) & 0xFF
+                    # キー入力処理（前回表示したフレームのまま表示間隔ぶん待ち、描画より先に状態を更新）
+                    key = cv2.waitKey(self.display_interval_ms) & 0xFF
                     if key == ord('q') or key == 27:  # 'q' or ESC
                         logger.info("ユーザーによる終了")
                         break
@@ -330,11 +728,13 @@ class CalibrationGUI:
                         self.calibration_points.clear()
                         self.is_calibrated = False
                         self.calibration_result = None
+                        self._overlay_key = None
                         logger.info("校正をリセットしました")
                     elif key == ord('t'):  # テストモード切り替え
                         if self.is_calibrated:
-                            test_mode = not test_mode
-                            mode_text = "テストモード" if test_mode else "校正モード"
+                            self.test_mode = not self.test_mode
+                            self._overlay_key = None
+                            mode_text = "テストモード" if self.test_mode else "校正モード"
                             logger.info(f"{mode_text}に切り替えました")
                         else:
                             logger.warning("校正が完了していません")
@@ -347,7 +747,27 @@ class CalibrationGUI:
                                 logger.error(f"❌ 校正データ保存エラー: {e}")
                         else:
                             logger.warning("保存する校正データがありません")
+                    
+                    # 取得スレッドが保持している最新フレーム（溜まった古いフレームは破棄済み）
+                    frame = self._latest_frame
+                    if frame is None:
+                        continue
+                    
+                    # フレーム・マウス位置・校正状態のいずれも変わっていなければ再描画しない
+                    paint_key = (id(frame), self._mouse_disp, len(self.calibration_points),
+                                 self.is_calibrated, self.test_mode)
+                    if paint_key == self._last_paint_key:
+                        continue
+                    
+                    self.current_frame = frame
+                    self._last_shown = self._render_display(frame)
+                    self._last_paint_key = paint_key
+                    
+                    # フレーム表示
+                    cv2.imshow(self.window_name, self._last_shown)
                 
+                self._stop_capture()
+                self._shutdown_draw_pool()
                 cv2.destroyAllWindows()
                 
                 # 最終結果表示
@@ -371,6 +791,8 @@ class CalibrationGUI:
                 return self.is_calibrated
                 
         except Exception as e:
+            self._stop_capture()
+            self._shutdown_draw_pool()
             logger.error(f"GUI校正ツールエラー: {e}")
             return False
 
@@ -383,6 +805,8 @@ def main():
                        help='実行時間（秒）、0で無制限')
     parser.add_argument('--config', type=str, default=None,
                        help='設定ファイルパス')
+    parser.add_argument('--display-width', type=int, default=960,
+                       help='表示幅の上限（これより大きいフレームは縮小表示）')
     
     args = parser.parse_args()
     
@@ -390,7 +814,7 @@ def main():
     config = load_config(args.config) if args.config else load_config()
     
     # GUI校正ツール実行
-    gui = CalibrationGUI(config, args.stream)
+    gui = CalibrationGUI(config, args.stream, display_max_width=args.display_width)
     success = gui.run_calibration(args.duration)
     
     if success:
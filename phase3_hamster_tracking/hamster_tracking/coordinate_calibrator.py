@@ -5,6 +5,7 @@
 ピクセル座標からmm座標への変換機能を提供
 """
 
+import math
 import os
 import sys
 # UTF-8エンコーディング強制設定
@@ -20,13 +21,28 @@ from datetime import datetime
 from dataclasses import dataclass, asdict
 import json
 
+# libyaml があれば C 実装の Loader/Dumper を使用（無ければ純Python版）
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 # プロジェクトモジュール
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from phase3_hamster_tracking.utils.hamster_config import HamsterTrackingConfig, load_config
+from phase3_hamster_tracking.utils.numba_compat import NUMBA_AVAILABLE
+from phase3_hamster_tracking.hamster_tracking._homography_kernels import homography4, invert3, project_points
 
 # ログ設定
 logger = logging.getLogger(__name__)
 
+# cv2.perspectiveTransform と同じ同次座標 w の下限（これ以下なら (0, 0) を返す）
+_W_EPS = float(np.finfo(np.float32).eps)
+
+# ホモグラフィ最下行がこの精度で [0, 0, 1] なら射影除算を省いたアフィン変換として扱う
+_AFFINE_EPS = 1e-10
+_AFFINE_SCALE_EPS = 1e-6
+
 @dataclass
 class CalibrationPoint:
     """校正点データクラス"""
@@ -91,6 +107,9 @@ class CalibrationResult:
 class CoordinateCalibrator:
     """座標校正システムメインクラス"""
     
+    # ケージ四隅の正規化座標 [左上, 右上, 右下, 左下]（ケージサイズを掛けると実世界座標 mm）
+    _UNIT_CORNERS = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]], dtype=np.float64)
+    
     def __init__(self, config: HamsterTrackingConfig = None):
         """
         初期化
@@ -101,10 +120,41 @@ class CoordinateCalibrator:
         self.config = config if config else load_config()
         self.cage_size = (self.config.cage.width, self.config.cage.height)
         
+        # ケージ四隅の実世界座標 (4, 2) mm（校正のたびに作り直さない）
+        self._world_corners = self._UNIT_CORNERS * np.array(self.cage_size, dtype=np.float64)
+        
         # 校正状態
         self.is_calibrated = False
         self.calibration_result: Optional[CalibrationResult] = None
         
+        # get_calibration_info の結果キャッシュ（校正状態が変わったら破棄）
+        self._info_cache: Optional[Dict[str, Any]] = None
+        
+        # 一括変換カーネル用の連続 float64 ホモグラフィ行列
+        self._H: Optional[np.ndarray] = None
+        
+        # 1点変換用に展開した行列要素（h00..h22 の9要素タプル）
+        self._h: Optional[Tuple[float, ...]] = None
+        self._h_inv: Optional[Tuple[float, ...]] = None
+        
+        # 最下行が [0, 0, 1] の場合のアフィン係数（a00..a12 の6要素タプル、該当しなければ None）
+        self._affine: Optional[Tuple[float, ...]] = None
+        self._affine_inv: Optional[Tuple[float, ...]] = None
+        
+        # 一括変換用のアフィン係数（x' = A @ x + t）
+        self._A: Optional[np.ndarray] = None
+        self._t: Optional[np.ndarray] = None
+        
+        # 校正点の SoA ビュー（pixel/world は (N, 2)、confidence は (N,) の float64、manual は (N,) bool）
+        self._pts_pixel: Optional[np.ndarray] = None
+        self._pts_world: Optional[np.ndarray] = None
+        self._pts_conf: Optional[np.ndarray] = None
+        self._pts_manual: Optional[np.ndarray] = None
+        
+        # 一括変換用の入出力バッファ（(N, 1, 2) float32、足りなくなった時だけ倍々で拡張）
+        self._batch_in = np.empty((64, 1, 2), dtype=np.float32)
+        self._batch_out = np.empty((64, 1, 2), dtype=np.float32)
+        
         # 校正ファイルパス
         config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
         self.calibration_file = os.path.join(config_dir, self.config.calibration.calibration_matrix_file)
@@ -129,43 +179,42 @@ class CoordinateCalibrator:
         
         logger.info("手動4点校正開始")
         
-        # ケージ四隅の実世界座標 (mm)
-        world_corners = [
-            (0, 0),                           # 左上
-            (self.cage_size[0], 0),           # 右上  
-            (self.cage_size[0], self.cage_size[1]), # 右下
-            (0, self.cage_size[1])            # 左下
-        ]
-        
-        # 校正点データ作成
-        calibration_points = []
-        for i, (pixel_pos, world_pos) in enumerate(zip(corner_pixels, world_corners)):
-            point = CalibrationPoint(
-                pixel_x=float(pixel_pos[0]),
-                pixel_y=float(pixel_pos[1]),
-                world_x=float(world_pos[0]),
-                world_y=float(world_pos[1]),
-                confidence=1.0,
-                manually_adjusted=True
-            )
-            calibration_points.append(point)
-        
-        # 座標変換行列計算
-        pixel_points = np.array([[cp.pixel_x, cp.pixel_y] for cp in calibration_points], dtype=np.float32)
-        world_points = np.array([[cp.world_x, cp.world_y] for cp in calibration_points], dtype=np.float32)
+        # 座標変換行列計算（ピクセル座標は入力から直接、実世界座標は事前計算済みの四隅を使用）
+        pixel_points = np.asarray(corner_pixels, dtype=np.float64).reshape(4, 2)
+        world_points = self._world_corners
         
-        # ホモグラフィ行列計算
-        homography_matrix, _ = cv2.findHomography(pixel_points, world_points, cv2.RANSAC)
+        # ホモグラフィ行列計算（4点なので8元連立方程式を直接解く。退化時は OpenCV にフォールバック）
+        # 4点対応では解が一意に決まり外れ値除去の余地がないため、フォールバックも RANSAC なしの最小二乗（method=0）
+        try:
+            homography_matrix = homography4(pixel_points, world_points)
+        except ValueError:
+            homography_matrix, _ = cv2.findHomography(pixel_points.astype(np.float32),
+                                                      world_points.astype(np.float32), 0)
         
         if homography_matrix is None:
             raise RuntimeError("ホモグラフィ行列の計算に失敗しました")
         
-        # 逆変換行列計算
-        inverse_homography = np.linalg.inv(homography_matrix)
+        # 逆変換行列計算（3x3 なので余因子から直接求める）
+        homography_matrix = np.ascontiguousarray(homography_matrix, dtype=np.float64)
+        try:
+            inverse_homography = invert3(homography_matrix)
+        except ValueError:
+            raise RuntimeError("逆変換行列の計算に失敗しました")
+        
+        # 校正点データ作成（変換行列の計算に成功してから）
+        calibration_points = [
+            CalibrationPoint(
+                pixel_x=pixel_x, pixel_y=pixel_y,
+                world_x=world_x, world_y=world_y,
+                confidence=1.0,
+                manually_adjusted=True
+            )
+            for (pixel_x, pixel_y), (world_x, world_y) in zip(pixel_points.tolist(), world_points.tolist())
+        ]
         
         # 校正精度評価
         rmse_error, max_error, mean_error = self._evaluate_calibration_accuracy(
-            calibration_points, homography_matrix
+            pixel_points, world_points, homography_matrix
         )
         
         # 校正結果作成
@@ -182,40 +231,105 @@ class CoordinateCalibrator:
         )
         
         self.is_calibrated = True
+        self._update_transform_cache()
         
         logger.info(f"手動4点校正完了 - RMSE誤差: {rmse_error:.2f}mm, 最大誤差: {max_error:.2f}mm")
         
         return self.calibration_result
     
-    def _evaluate_calibration_accuracy(self, calibration_points: List[CalibrationPoint], 
+    def _evaluate_calibration_accuracy(self, pixel_points: np.ndarray, world_points: np.ndarray,
                                      homography_matrix: np.ndarray) -> Tuple[float, float, float]:
         """
         校正精度評価
         
+        Args:
+            pixel_points: 校正点のピクセル座標 (N, 2)
+            world_points: 校正点の実世界座標 (N, 2) mm
+            homography_matrix: 評価するホモグラフィ行列
+        
         Returns:
             Tuple[RMSE誤差, 最大誤差, 平均誤差] (mm単位)
         """
-        errors = []
-        
-        for point in calibration_points:
-            # ピクセル座標をmm座標に変換
-            pixel_point = np.array([[point.pixel_x, point.pixel_y]], dtype=np.float32)
-            pixel_point = np.array([pixel_point])  # shape: (1, 1, 2)
-            
-            converted_point = cv2.perspectiveTransform(pixel_point, homography_matrix)[0][0]
-            
-            # 誤差計算
-            error_x = converted_point[0] - point.world_x
-            error_y = converted_point[1] - point.world_y
-            error_distance = np.sqrt(error_x**2 + error_y**2)
-            errors.append(error_distance)
-        
-        rmse_error = np.sqrt(np.mean(np.array(errors)**2))
+        # 全校正点を1回の perspectiveTransform でまとめて変換
+        converted_points = cv2.perspectiveTransform(
+            pixel_points.astype(np.float32).reshape(-1, 1, 2), homography_matrix
+        ).reshape(-1, 2)
+        
+        # 誤差計算（点ごとのユークリッド距離）
+        diff = converted_points - world_points.astype(np.float32)
+        squared_errors = np.einsum('ij,ij->i', diff, diff)
+        errors = np.sqrt(squared_errors)
+        
+        # RMSE は二乗誤差から直接求める（errors を再度二乗する一時配列を作らない）
+        rmse_error = np.sqrt(np.mean(squared_errors))
         max_error = np.max(errors)
         mean_error = np.mean(errors)
         
         return rmse_error, max_error, mean_error
     
+    @staticmethod
+    def _points_to_arrays(calibration_points: List[CalibrationPoint]) -> Tuple[np.ndarray, ...]:
+        """校正点リストを SoA 配列（pixel_xy, world_xy, confidence, manual）に変換"""
+        n = len(calibration_points)
+        pair = np.dtype((np.float64, 2))
+        pixel_xy = np.fromiter(((cp.pixel_x, cp.pixel_y) for cp in calibration_points), dtype=pair, count=n)
+        world_xy = np.fromiter(((cp.world_x, cp.world_y) for cp in calibration_points), dtype=pair, count=n)
+        confidence = np.fromiter((cp.confidence for cp in calibration_points), dtype=np.float64, count=n)
+        manual = np.fromiter((cp.manually_adjusted for cp in calibration_points), dtype=bool, count=n)
+        return pixel_xy.reshape(n, 2), world_xy.reshape(n, 2), confidence, manual
+    
+    def _update_transform_cache(self) -> None:
+        """校正結果の変換行列を1点変換用の float タプルに展開し、校正点の SoA ビューを作り直す"""
+        self._info_cache = None
+        if self.calibration_result is None:
+            self._pts_pixel = None
+            self._pts_world = None
+            self._pts_conf = None
+            self._pts_manual = None
+            self._H = None
+            self._h = None
+            self._h_inv = None
+            self._affine = None
+            self._affine_inv = None
+            self._A = None
+            self._t = None
+            return
+        
+        (self._pts_pixel, self._pts_world,
+         self._pts_conf, self._pts_manual) = self._points_to_arrays(self.calibration_result.calibration_points)
+        
+        self._H = np.ascontiguousarray(self.calibration_result.homography_matrix, dtype=np.float64)
+        self._h = tuple(float(v) for v in self._H.ravel())
+        self._h_inv = tuple(float(v) for v in np.asarray(self.calibration_result.inverse_homography).ravel())
+        
+        # ほぼ正面から撮影したケージではアフィン変換になることがあるので、その場合は除算を省く
+        self._affine = self._to_affine(self._h)
+        self._affine_inv = self._to_affine(self._h_inv)
+        if self._affine is not None:
+            a = np.array(self._affine, dtype=np.float64).reshape(2, 3)
+            self._A = np.ascontiguousarray(a[:, :2])
+            self._t = np.ascontiguousarray(a[:, 2])
+        else:
+            self._A = None
+            self._t = None
+    
+    @staticmethod
+    def _to_affine(h: Tuple[float, ...]) -> Optional[Tuple[float, ...]]:
+        """最下行が [0, 0, 1] ならアフィン係数（h22 で正規化した上2行）を返す"""
+        h00, h01, h02, h10, h11, h12, h20, h21, h22 = h
+        if abs(h20) >= _AFFINE_EPS or abs(h21) >= _AFFINE_EPS or abs(h22 - 1.0) >= _AFFINE_SCALE_EPS:
+            return None
+        return (h00 / h22, h01 / h22, h02 / h22, h10 / h22, h11 / h22, h12 / h22)
+    
+    @staticmethod
+    def _apply_homography(h: Tuple[float, ...], x: float, y: float) -> Tuple[float, float]:
+        """3x3 ホモグラフィを1点に適用（配列を作らずスカラー演算のみで計算）"""
+        h00, h01, h02, h10, h11, h12, h20, h21, h22 = h
+        w = h20 * x + h21 * y + h22
+        if abs(w) <= _W_EPS:
+            return 0.0, 0.0
+        return (h00 * x + h01 * y + h02) / w, (h10 * x + h11 * y + h12) / w
+    
     def pixel_to_mm(self, pixel_coord: Tuple[float, float]) -> Tuple[float, float]:
         """
         ピクセル座標をmm座標に変換
@@ -229,11 +343,27 @@ class CoordinateCalibrator:
         if not self.is_calibrated or self.calibration_result is None:
             raise RuntimeError("校正が完了していません")
         
-        # OpenCV用の座標変換
-        pixel_point = np.array([[pixel_coord]], dtype=np.float32)
-        mm_point = cv2.perspectiveTransform(pixel_point, self.calibration_result.homography_matrix)[0][0]
+        if self._h is None:
+            self._update_transform_cache()
+        
+        x, y = float(pixel_coord[0]), float(pixel_coord[1])
+        if self._affine is not None:
+            a00, a01, a02, a10, a11, a12 = self._affine
+            return a00 * x + a01 * y + a02, a10 * x + a11 * y + a12
+        
+        return self._apply_homography(self._h, x, y)
+    
+    def get_homography_matrix(self) -> Optional[np.ndarray]:
+        """
+        ピクセル→mm変換のホモグラフィ行列を取得
+        
+        Returns:
+            3x3ホモグラフィ行列（未校正の場合は None）
+        """
+        if not self.is_calibrated or self.calibration_result is None:
+            return None
         
-        return float(mm_point[0]), float(mm_point[1])
+        return self.calibration_result.homography_matrix
     
     def mm_to_pixel(self, mm_coord: Tuple[float, float]) -> Tuple[float, float]:
         """
@@ -248,11 +378,59 @@ class CoordinateCalibrator:
         if not self.is_calibrated or self.calibration_result is None:
             raise RuntimeError("校正が完了していません")
         
-        # OpenCV用の座標変換
-        mm_point = np.array([[mm_coord]], dtype=np.float32)
-        pixel_point = cv2.perspectiveTransform(mm_point, self.calibration_result.inverse_homography)[0][0]
+        if self._h_inv is None:
+            self._update_transform_cache()
+        
+        x, y = float(mm_coord[0]), float(mm_coord[1])
+        if self._affine_inv is not None:
+            a00, a01, a02, a10, a11, a12 = self._affine_inv
+            return a00 * x + a01 * y + a02, a10 * x + a11 * y + a12
+        
+        return self._apply_homography(self._h_inv, x, y)
+    
+    def _batch_buffers(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """n 点分の一括変換用入出力バッファ（先頭 n 行のビュー）を取得"""
+        if n > self._batch_in.shape[0]:
+            capacity = max(n, self._batch_in.shape[0] * 2)
+            self._batch_in = np.empty((capacity, 1, 2), dtype=np.float32)
+            self._batch_out = np.empty((capacity, 1, 2), dtype=np.float32)
+        return self._batch_in[:n], self._batch_out[:n]
+    
+    def batch_pixel_to_mm_array(self, pixel_coords) -> np.ndarray:
+        """
+        複数のピクセル座標を一括でmm座標に変換（NumPy配列で返す）
+        
+        Args:
+            pixel_coords: ピクセル座標のリスト、または (N, 2) 配列
+            
+        Returns:
+            mm座標の (N, 2) float32 配列
+        """
+        if not self.is_calibrated or self.calibration_result is None:
+            raise RuntimeError("校正が完了していません")
+        
+        n = len(pixel_coords)
+        if n == 0:
+            return np.empty((0, 2), dtype=np.float32)
         
-        return float(pixel_point[0]), float(pixel_point[1])
+        if self._h is None:
+            self._update_transform_cache()
+        
+        # バッチ変換（OpenCV形式 (N, 1, 2) の作業バッファを使い回す）
+        pixel_points, mm_points = self._batch_buffers(n)
+        pixel_points[:, 0] = np.asarray(pixel_coords, dtype=np.float32).reshape(-1, 2)
+        
+        if self._A is not None:
+            # アフィン変換なら射影除算なしの行列積のみ
+            mm_points[:, 0] = pixel_points[:, 0] @ self._A.T + self._t
+        elif NUMBA_AVAILABLE:
+            # 1点ずつの射影除算を JIT カーネルで行う（点数が多ければ並列化）
+            project_points(self._H, pixel_points, mm_points)
+        else:
+            cv2.perspectiveTransform(pixel_points, self.calibration_result.homography_matrix, dst=mm_points)
+        
+        # 作業バッファは次回上書きされるのでコピーを返す
+        return mm_points.reshape(-1, 2).copy()
     
     def batch_pixel_to_mm(self, pixel_coords: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
         """
@@ -267,17 +445,11 @@ class CoordinateCalibrator:
         if not self.is_calibrated or self.calibration_result is None:
             raise RuntimeError("校正が完了していません")
         
-        if not pixel_coords:
+        if len(pixel_coords) == 0:
             return []
         
-        # バッチ変換
-        pixel_points = np.array([list(coord) for coord in pixel_coords], dtype=np.float32)
-        pixel_points = pixel_points.reshape(-1, 1, 2)  # OpenCV形式に変換
-        
-        mm_points = cv2.perspectiveTransform(pixel_points, self.calibration_result.homography_matrix)
-        
-        # 結果をタプルのリストに変換
-        return [(float(point[0][0]), float(point[0][1])) for point in mm_points]
+        # 結果をタプルのリストに変換（tolist で Python float へ一括変換）
+        return list(map(tuple, self.batch_pixel_to_mm_array(pixel_coords).tolist()))
     
     def validate_calibration(self, test_distance_mm: float = None) -> Dict[str, Any]:
         """
@@ -301,20 +473,16 @@ class CoordinateCalibrator:
         cage_center_mm = (self.cage_size[0] / 2, self.cage_size[1] / 2)
         test_point_mm = (cage_center_mm[0] + test_distance_mm, cage_center_mm[1])
         
-        # mm → pixel → mm変換テスト
+        # mm → pixel → mm変換テスト（2点ともスカラー演算の1点変換で往復させる）
         center_pixel = self.mm_to_pixel(cage_center_mm)
         test_pixel = self.mm_to_pixel(test_point_mm)
-        
-        # ピクセル座標での距離計算
-        pixel_distance = np.sqrt((test_pixel[0] - center_pixel[0])**2 + (test_pixel[1] - center_pixel[1])**2)
-        
-        # ピクセル座標をmm座標に逆変換
         center_mm_converted = self.pixel_to_mm(center_pixel)
         test_mm_converted = self.pixel_to_mm(test_pixel)
         
-        # 変換後のmm距離計算
-        converted_distance = np.sqrt((test_mm_converted[0] - center_mm_converted[0])**2 + 
-                                   (test_mm_converted[1] - center_mm_converted[1])**2)
+        # ピクセル座標・変換後のmm座標での距離計算
+        pixel_distance = math.hypot(test_pixel[0] - center_pixel[0], test_pixel[1] - center_pixel[1])
+        converted_distance = math.hypot(test_mm_converted[0] - center_mm_converted[0],
+                                        test_mm_converted[1] - center_mm_converted[1])
         
         # 誤差計算
         distance_error = abs(converted_distance - test_distance_mm)
@@ -354,67 +522,85 @@ class CoordinateCalibrator:
         if file_path is None:
             file_path = self.calibration_file
         
+        if self._pts_pixel is None:
+            self._update_transform_cache()
+        
+        # 各セクションで共通に使う値は1回だけ計算
+        result = self.calibration_result
+        now = datetime.now()
+        rmse_error = float(result.rmse_error)
+        max_error = float(result.max_error)
+        mean_error = float(result.mean_error)
+        accuracy_threshold = float(self.config.calibration.accuracy_threshold_mm)
+        meets_accuracy = bool(rmse_error <= accuracy_threshold)
+        
         # 校正データをYAML形式で準備
         calibration_data = {
             'calibration_info': {
                 'status': 'calibrated',
-                'created_at': self.calibration_result.timestamp,
-                'last_updated': datetime.now().isoformat() + 'Z',
-                'cage_size_mm': list(self.calibration_result.cage_size_mm),
-                'method': self.calibration_result.calibration_method,
-                'validation_error_mm': float(self.calibration_result.rmse_error),
+                'created_at': result.timestamp,
+                'last_updated': now.isoformat() + 'Z',
+                'cage_size_mm': list(result.cage_size_mm),
+                'method': result.calibration_method,
+                'validation_error_mm': rmse_error,
                 'operator': 'CoordinateCalibrator',
-                'notes': f'Auto-generated calibration data with {self.calibration_result.calibration_method} method'
+                'notes': f'Auto-generated calibration data with {result.calibration_method} method'
             },
             
             'transformation_matrix': {
-                'homography': self.calibration_result.homography_matrix.tolist(),
-                'inverse_homography': self.calibration_result.inverse_homography.tolist(),
+                'homography': result.homography_matrix.tolist(),
+                'inverse_homography': result.inverse_homography.tolist(),
                 'statistics': {
                     'pixel_to_mm_ratio_x': float(self.cage_size[0] / 640),  # 概算値
                     'pixel_to_mm_ratio_y': float(self.cage_size[1] / 480),  # 概算値
-                    'rmse_error_mm': float(self.calibration_result.rmse_error),
-                    'max_error_mm': float(self.calibration_result.max_error),
-                    'mean_error_mm': float(self.calibration_result.mean_error)
+                    'rmse_error_mm': rmse_error,
+                    'max_error_mm': max_error,
+                    'mean_error_mm': mean_error
                 }
             },
             
             'calibration_points': {
-                'pixel_coordinates': [[cp.pixel_x, cp.pixel_y] for cp in self.calibration_result.calibration_points],
-                'world_coordinates_mm': [[cp.world_x, cp.world_y] for cp in self.calibration_result.calibration_points],
+                'pixel_coordinates': self._pts_pixel.tolist(),
+                'world_coordinates_mm': self._pts_world.tolist(),
                 'point_quality': {
-                    'detection_confidence': [cp.confidence for cp in self.calibration_result.calibration_points],
-                    'manual_adjustment': [cp.manually_adjusted for cp in self.calibration_result.calibration_points]
+                    'detection_confidence': self._pts_conf.tolist(),
+                    'manual_adjustment': self._pts_manual.tolist()
                 }
             },
             
             'accuracy_metrics': {
-                'rmse_error_mm': float(self.calibration_result.rmse_error),
-                'max_error_mm': float(self.calibration_result.max_error),
-                'mean_error_mm': float(self.calibration_result.mean_error),
-                'accuracy_threshold_mm': float(self.config.calibration.accuracy_threshold_mm),
-                'meets_accuracy_requirement': bool(self.calibration_result.rmse_error <= self.config.calibration.accuracy_threshold_mm)
+                'rmse_error_mm': rmse_error,
+                'max_error_mm': max_error,
+                'mean_error_mm': mean_error,
+                'accuracy_threshold_mm': accuracy_threshold,
+                'meets_accuracy_requirement': meets_accuracy
             },
             
             'quality_control': {
-                'calibration_id': f"cal_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                'validation_passed': bool(self.calibration_result.rmse_error <= self.config.calibration.accuracy_threshold_mm),
-                'approval_status': 'approved' if self.calibration_result.rmse_error <= self.config.calibration.accuracy_threshold_mm else 'needs_review'
+                'calibration_id': f"cal_{now.strftime('%Y%m%d_%H%M%S')}",
+                'validation_passed': meets_accuracy,
+                'approval_status': 'approved' if meets_accuracy else 'needs_review'
             }
         }
         
         try:
-            # バックアップ作成
+            # バックアップ作成（ハードリンクならファイル内容をコピーせずに済む。非対応環境ではコピー）
             if os.path.exists(file_path):
                 backup_path = file_path + '.backup.' + datetime.now().strftime('%Y%m%d_%H%M%S')
-                import shutil
-                shutil.copy2(file_path, backup_path)
+                try:
+                    os.link(file_path, backup_path)
+                except (OSError, AttributeError):
+                    import shutil
+                    shutil.copy2(file_path, backup_path)
                 logger.info(f"既存校正データをバックアップ: {backup_path}")
             
             # 新しい校正データ保存
-            with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(calibration_data, f, default_flow_style=False, 
+            # 一時ファイルに書いてから置き換える（既存ファイルを上書きするとハードリンク先のバックアップまで書き換わるため）
+            temp_path = file_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                yaml.dump(calibration_data, f, Dumper=_YamlDumper, default_flow_style=False, 
                          allow_unicode=True, indent=2, sort_keys=False)
+            os.replace(temp_path, file_path)
             
             logger.info(f"校正データを保存しました: {file_path}")
             
@@ -441,7 +627,7 @@ class CoordinateCalibrator:
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                calibration_data = yaml.safe_load(f)
+                calibration_data = yaml.load(f, Loader=_YamlLoader)
             
             # 校正データの有効性チェック
             if not calibration_data.get('calibration_info', {}).get('status') == 'calibrated':
@@ -461,19 +647,25 @@ class CoordinateCalibrator:
             points_data = calibration_data.get('calibration_points', {})
             pixel_coords = points_data.get('pixel_coordinates', [])
             world_coords = points_data.get('world_coordinates_mm', [])
-            confidences = points_data.get('point_quality', {}).get('detection_confidence', [1.0] * len(pixel_coords))
-            manual_flags = points_data.get('point_quality', {}).get('manual_adjustment', [False] * len(pixel_coords))
+            point_quality = points_data.get('point_quality', {})
+            n_points = min(len(pixel_coords), len(world_coords))
+            
+            # 品質情報が欠けている点は既定値で補う（1回の走査で校正点を作成するため長さを揃える）
+            confidences = list(point_quality.get('detection_confidence', []))[:n_points]
+            confidences += [1.0] * (n_points - len(confidences))
+            manual_flags = list(point_quality.get('manual_adjustment', []))[:n_points]
+            manual_flags += [False] * (n_points - len(manual_flags))
             
             # 校正点オブジェクト作成
-            calibration_points = []
-            for i, (pixel, world) in enumerate(zip(pixel_coords, world_coords)):
-                point = CalibrationPoint(
+            calibration_points = [
+                CalibrationPoint(
                     pixel_x=pixel[0], pixel_y=pixel[1],
                     world_x=world[0], world_y=world[1],
-                    confidence=confidences[i] if i < len(confidences) else 1.0,
-                    manually_adjusted=manual_flags[i] if i < len(manual_flags) else False
+                    confidence=confidence,
+                    manually_adjusted=manual
                 )
-                calibration_points.append(point)
+                for pixel, world, confidence, manual in zip(pixel_coords, world_coords, confidences, manual_flags)
+            ]
             
             # 精度メトリクスの復元
             accuracy_data = calibration_data.get('accuracy_metrics', {})
@@ -495,6 +687,7 @@ class CoordinateCalibrator:
             )
             
             self.is_calibrated = True
+            self._update_transform_cache()
             
             logger.info(f"校正データを読み込みました: {file_path} (誤差: {rmse_error:.2f}mm)")
             return True
@@ -504,13 +697,21 @@ class CoordinateCalibrator:
             return False
     
     def get_calibration_info(self) -> Dict[str, Any]:
-        """校正情報を取得"""
+        """校正情報を取得（校正・読み込み・リセットまでは前回の結果を再利用）"""
         if not self.is_calibrated or self.calibration_result is None:
             return {
                 'is_calibrated': False,
                 'status': 'uncalibrated'
             }
         
+        if self._info_cache is None:
+            self._info_cache = self._build_calibration_info()
+        
+        # 呼び出し側での変更がキャッシュに及ばないよう浅いコピーを返す
+        return dict(self._info_cache)
+    
+    def _build_calibration_info(self) -> Dict[str, Any]:
+        """get_calibration_info の辞書を作成"""
         return {
             'is_calibrated': True,
             'status': 'calibrated',
@@ -527,6 +728,7 @@ class CoordinateCalibrator:
         """校正データをリセット"""
         self.is_calibrated = False
         self.calibration_result = None
+        self._update_transform_cache()
         logger.info("校正データをリセットしました")
 
 def demo_calibration():
@@ -209,6 +209,55 @@ class MovementTrackingConfig:
             
         return len(errors) == 0, errors
 
+@dataclass
+class MotionDetectionConfig:
+    """動作検出設定データクラス"""
+    # 背景モデル
+    subtractor: str = "mog2"             # "mog2" / "knn" / "running_mean"（移動平均背景）
+    simple_bg: bool = False              # True なら subtractor に関わらず "running_mean"（旧設定互換）
+    bg_learning_rate: float = 0.005      # 移動平均背景の更新率
+    bg_diff_threshold: int = 25          # 移動平均背景との差分二値化閾値
+    use_numba: bool = False              # simple_bg 時に numba 融合カーネルで前処理〜二値化を1パス実行
+    # 静止フレームゲート（縮小フレームと背景サムネイルの差分が小さければ背景差分以降を省略）
+    gate_enabled: bool = False           # 調整が済むまで既定は無効
+    gate_noise_level: int = 2            # 縮小後の画素差がこれ以下ならノイズとして無視
+    gate_min_area_fraction: float = 0.5  # 最小面積のハムスター1匹分の差分量に対する判定閾値の比率
+    gate_refresh_frames: int = 30        # 静止中もこの間隔で背景モデルを更新
+    gate_warmup_frames: int = 100        # 背景モデルが安定するまではゲートを無効化
+    # 自動撮影の動作トリガー
+    capture_trigger_method: str = "mog2" # "mog2"（背景差分） / "frame_diff"（3フレーム差分、明るいケージ向け）
+    frame_diff_threshold: int = 25       # 3フレーム差分の二値化閾値
+    
+    def validate(self) -> Tuple[bool, List[str]]:
+        """設定値の妥当性をチェック"""
+        errors = []
+        
+        if self.subtractor not in ["mog2", "knn", "running_mean"]:
+            errors.append("背景差分方式は mog2, knn, running_mean のいずれかである必要があります")
+            
+        if not 0.0 < self.bg_learning_rate <= 1.0:
+            errors.append("背景更新率は0.0より大きく1.0以下である必要があります")
+            
+        if not 0 <= self.bg_diff_threshold <= 255:
+            errors.append("背景差分閾値は0-255の範囲である必要があります")
+            
+        if not 0 <= self.gate_noise_level <= 255:
+            errors.append("ゲートのノイズ閾値は0-255の範囲である必要があります")
+            
+        if self.gate_min_area_fraction <= 0:
+            errors.append("ゲートの面積比率は正の値である必要があります")
+            
+        if self.gate_refresh_frames < 0 or self.gate_warmup_frames < 0:
+            errors.append("ゲートの更新間隔・ウォームアップフレーム数は0以上である必要があります")
+            
+        if self.capture_trigger_method not in ["mog2", "frame_diff"]:
+            errors.append("撮影トリガーの動作検出方式は mog2, frame_diff のいずれかである必要があります")
+            
+        if not 0 <= self.frame_diff_threshold <= 255:
+            errors.append("フレーム差分閾値は0-255の範囲である必要があります")
+            
+        return len(errors) == 0, errors
+
 @dataclass
 class MonitoringConfig:
     """システム監視設定データクラス"""
@@ -258,6 +307,7 @@ class HamsterTrackingConfig:
     calibration: CalibrationConfig = field(default_factory=CalibrationConfig)
     deeplabcut: DeepLabCutConfig = field(default_factory=DeepLabCutConfig)
     movement: MovementTrackingConfig = field(default_factory=MovementTrackingConfig)
+    motion: MotionDetectionConfig = field(default_factory=MotionDetectionConfig)
     monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
     
     # データ収集設定
@@ -361,6 +411,28 @@ class HamsterTrackingConfig:
                     activity_threshold_mm_per_min=stat_data.get('activity_threshold_mm_per_min', config.movement.activity_threshold_mm_per_min)
                 )
             
+            # 動作検出設定
+            if 'motion_detection' in yaml_data:
+                motion_data = yaml_data['motion_detection']
+                bg_data = motion_data.get('background', {})
+                gate_data = motion_data.get('gate', {})
+                trigger_data = motion_data.get('capture_trigger', {})
+                
+                config.motion = MotionDetectionConfig(
+                    subtractor=bg_data.get('subtractor', config.motion.subtractor),
+                    simple_bg=bg_data.get('simple_bg', config.motion.simple_bg),
+                    bg_learning_rate=bg_data.get('learning_rate', config.motion.bg_learning_rate),
+                    bg_diff_threshold=bg_data.get('diff_threshold', config.motion.bg_diff_threshold),
+                    use_numba=bg_data.get('use_numba', config.motion.use_numba),
+                    gate_enabled=gate_data.get('enabled', config.motion.gate_enabled),
+                    gate_noise_level=gate_data.get('noise_level', config.motion.gate_noise_level),
+                    gate_min_area_fraction=gate_data.get('min_area_fraction', config.motion.gate_min_area_fraction),
+                    gate_refresh_frames=gate_data.get('refresh_frames', config.motion.gate_refresh_frames),
+                    gate_warmup_frames=gate_data.get('warmup_frames', config.motion.gate_warmup_frames),
+                    capture_trigger_method=trigger_data.get('method', config.motion.capture_trigger_method),
+                    frame_diff_threshold=trigger_data.get('frame_diff_threshold', config.motion.frame_diff_threshold)
+                )
+            
             # 監視設定
             if 'monitoring' in yaml_data:
                 mon_data = yaml_data['monitoring']
@@ -457,6 +529,26 @@ class HamsterTrackingConfig:
                         'activity_threshold_mm_per_min': self.movement.activity_threshold_mm_per_min
                     }
                 },
+                'motion_detection': {
+                    'background': {
+                        'subtractor': self.motion.subtractor,
+                        'simple_bg': self.motion.simple_bg,
+                        'learning_rate': self.motion.bg_learning_rate,
+                        'diff_threshold': self.motion.bg_diff_threshold,
+                        'use_numba': self.motion.use_numba
+                    },
+                    'gate': {
+                        'enabled': self.motion.gate_enabled,
+                        'noise_level': self.motion.gate_noise_level,
+                        'min_area_fraction': self.motion.gate_min_area_fraction,
+                        'refresh_frames': self.motion.gate_refresh_frames,
+                        'warmup_frames': self.motion.gate_warmup_frames
+                    },
+                    'capture_trigger': {
+                        'method': self.motion.capture_trigger_method,
+                        'frame_diff_threshold': self.motion.frame_diff_threshold
+                    }
+                },
                 'monitoring': {
                     'performance': {
                         'target_fps': self.monitoring.target_fps,
@@ -496,6 +588,7 @@ class HamsterTrackingConfig:
         cal_valid, cal_errors = self.calibration.validate()
         dlc_valid, dlc_errors = self.deeplabcut.validate()
         move_valid, move_errors = self.movement.validate()
+        motion_valid, motion_errors = self.motion.validate()
         mon_valid, mon_errors = self.monitoring.validate()
         
         # エラー収集
@@ -507,6 +600,8 @@ class HamsterTrackingConfig:
             all_errors.extend([f"DeepLabCut設定: {err}" for err in dlc_errors])
         if not move_valid:
             all_errors.extend([f"移動追跡設定: {err}" for err in move_errors])
+        if not motion_valid:
+            all_errors.extend([f"動作検出設定: {err}" for err in motion_errors])
         if not mon_valid:
             all_errors.extend([f"監視設定: {err}" for err in mon_errors])
         
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Numba互換レイヤー
+numba がインストールされていない環境でもモジュールを import できるようにする
+"""
+
+import logging
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange, guvectorize, get_num_threads
+    NUMBA_AVAILABLE = True
+    
+    # 並列ランタイムを import 元（通常はメインスレッド）で起動しておく。
+    # TBB スレッド層はワーカースレッドから初回起動されると終了時にハングするため、
+    # キャプチャ/評価スレッドから parallel カーネルを呼ぶ前に起動を済ませる。
+    get_num_threads()
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba未導入時のダミーデコレータ（関数をそのまま返す）"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+    def guvectorize(*args, **kwargs):
+        """numba未導入時のダミーデコレータ（呼び出し側は NUMBA_AVAILABLE で分岐すること）"""
+        def decorator(func):
+            return func
+        return decorator
+
+    logger.debug("numba が見つかりません - OpenCV/NumPy 実装にフォールバックします")
@@ -4,14 +4,36 @@ RTSPストリーム基本クラス
 Reolink RLC-510Aからの映像ストリーミング機能を提供
 """
 
+import os
 import cv2
 import time
+import socket
 import threading
 import queue
 import logging
+from contextlib import contextmanager
 from typing import Optional, Callable
 from utils.camera_config import get_camera_config, prompt_password_if_needed
 
+# FFmpegの任意オプションは VideoCapture のパラメータでは渡せず、接続時に読まれる環境変数のみ対応。
+# 環境変数はプロセス共通のため、接続中のみ設定して終了後に戻す（同時接続はロックで直列化）
+_FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_ffmpeg_options_lock = threading.Lock()
+
+@contextmanager
+def _ffmpeg_capture_options(options: str):
+    """接続中のみFFmpegオプションを環境変数に設定（ユーザーが環境変数を設定済みならそちらを優先）"""
+    with _ffmpeg_options_lock:
+        if not options or _FFMPEG_OPTIONS_ENV in os.environ:
+            yield
+            return
+        
+        os.environ[_FFMPEG_OPTIONS_ENV] = options
+        try:
+            yield
+        finally:
+            os.environ.pop(_FFMPEG_OPTIONS_ENV, None)
+
 class RTSPStream:
     """RTSPストリーム管理クラス"""
     
@@ -60,7 +82,7 @@ class RTSPStream:
             self.logger.info(f"RTSP接続開始: {rtsp_url}")
             
             # VideoCapture設定
-            self.cap = cv2.VideoCapture(rtsp_url)
+            self.cap = self._open_capture(rtsp_url)
             
             # OpenCV設定
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
@@ -83,6 +105,42 @@ class RTSPStream:
             self._cleanup()
             return False
     
+    def _open_capture(self, rtsp_url: str) -> cv2.VideoCapture:
+        """FFmpegバックエンドを低遅延・ハードウェアデコード優先で開く"""
+        # 接続タイムアウトは VideoCapture のパラメータで指定（OpenCV 4.5.2以降）
+        params = []
+        if hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+            params += [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, self.config.open_timeout_ms]
+        
+        with _ffmpeg_capture_options(self.config.ffmpeg_capture_options):
+            # ハードウェアデコード（OpenCV 4.5.2以降）
+            if self.config.hw_decode and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+                start = time.monotonic()
+                cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG,
+                                       params + [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+                if cap.isOpened():
+                    return cap
+                cap.release()
+                
+                # カメラに到達できない場合はソフトウェアデコードでも失敗するため再試行しない
+                if self._is_network_failure(time.monotonic() - start):
+                    self.logger.error("カメラに接続できません - ソフトウェアデコードでの再接続は行いません")
+                    return cap
+                self.logger.warning("ハードウェアデコード初期化失敗 - ソフトウェアデコードで再接続")
+            
+            return cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, params)
+    
+    def _is_network_failure(self, elapsed_sec: float) -> bool:
+        """接続失敗がネットワーク起因か判定（接続タイムアウトに達した、またはRTSPポートに到達できない）"""
+        if elapsed_sec * 1000.0 >= self.config.open_timeout_ms * 0.9:
+            return True
+        
+        try:
+            with socket.create_connection((self.config.ip, self.config.rtsp_port), timeout=2.0):
+                return False
+        except OSError:
+            return True
+    
     def start_stream(self) -> bool:
         """ストリーミング開始"""
         if not self.is_connected:
@@ -196,6 +254,31 @@ class RTSPStream:
                     return (True, self.current_frame.copy())
             return (False, None)
     
+    def drain_latest(self, timeout: float = 1.0) -> Optional[tuple]:
+        """
+        バッファ内の古いフレームを破棄して最新フレームのみを取得
+        
+        Returns:
+            (success, frame) または None
+        """
+        if not self.is_running:
+            return None
+        
+        frame = None
+        while True:
+            try:
+                latest = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+            if frame is not None:
+                self.dropped_frames += 1  # 古いフレームを破棄
+            frame = latest
+        
+        if frame is not None:
+            return (True, frame)
+        
+        return self.get_frame(timeout=timeout)
+    
     def get_current_frame(self) -> Optional[tuple]:
         """
         現在のフレームを取得（非ブロッキング）
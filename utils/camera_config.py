@@ -28,6 +28,11 @@ class CameraConfig:
     sub_resolution: tuple = (640, 480)     # VGA
     target_fps: int = 15
     
+    # デコード設定（OpenCV FFmpegバックエンド向け低遅延オプション）
+    ffmpeg_capture_options: str = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+    hw_decode: bool = True  # 利用可能ならハードウェアデコードを使用
+    open_timeout_ms: int = 5000  # RTSP接続タイムアウト（ミリ秒）
+    
     # 録画設定
     video_codec: str = "mp4v"  # または "XVID"
     video_extension: str = ".mp4"